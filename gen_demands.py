@@ -1,9 +1,18 @@
 """Generate demand letters for all delinquent Kirby Gate targets from live database."""
 
+import argparse
+import copy
+import io
 import os
+import queue
+import re
 import sqlite3
 import sys
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
 
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
@@ -11,6 +20,8 @@ if sys.platform == "win32":
 from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from lxml import etree
 
 BASEDIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASEDIR, "kirbygate.db")
@@ -22,6 +33,7 @@ LIEN_DEADLINE = "April 1, 2026"
 CURE_DAYS = 30
 TODAY_STR = datetime.now().strftime("%B %d, %Y")
 CURE_DATE = (datetime.now() + timedelta(days=CURE_DAYS)).strftime("%B %d, %Y")
+CAMPUS_SQFT_STR = f"{TOTAL_CAMPUS_SQFT:,}"
 
 INSTRUMENT_CITATION = (
     "This notice is issued pursuant to Section 5 (Default) and Section 6 "
@@ -30,6 +42,68 @@ INSTRUMENT_CITATION = (
     "County, Tennessee."
 )
 
+DEFAULT_NOTICE = (
+    "This letter constitutes formal notice that the above-referenced property "
+    "is in material default of the Declaration of Restrictive Covenants recorded "
+    f'on {DECLARATION_DATE} (the "Declaration") governing the Kirby Gate '
+    "commercial development, Memphis, Tennessee."
+)
+
+FAILURE_TO_CURE_INTRO = (
+    "FAILURE TO CURE this default by the cure deadline will result in "
+    "the following actions:"
+)
+
+FAILURE_TO_CURE_ITEMS = (
+    "  1. Filing of a Notice of Lien against the property under the "
+    f"Declaration (target date: {LIEN_DEADLINE})",
+    "  2. Referral to counsel for enforcement of all rights under the "
+    "Declaration, including recovery of attorneys\u2019 fees and costs "
+    "as provided therein",
+    "  3. Notice to senior lenders and title companies of the recorded lien",
+    # Refinement #3: Fourth failure-to-cure item
+    "  4. Notification to regulatory agencies, insurance carriers, and "
+    "business partners of the security impairment at the property, as applicable.",
+)
+
+GOVERNING_LAW = (
+    "This matter is governed by Tennessee law. The Declaration provides for "
+    "lien rights, fee-shifting, and forum selection in Shelby County, Tennessee. "
+    "The applicable statute of limitations for contract enforcement is six (6) years."
+)
+
+RESOLUTION_CONFERENCE = (
+    "We are prepared to discuss a reasonable resolution of the arrears balance, "
+    "including structured payment arrangements, provided forward compliance is "
+    "established immediately. Please contact this office within ten (10) business "
+    "days of receipt to schedule a resolution conference."
+)
+
+SIGNATURE_BLOCK = (
+    "Respectfully,",
+    "",
+    "",
+    "____________________________________",
+    "Walter D. Wills III",
+    "Managing Partner, Wills & Wills LP",
+    "Declarant",
+)
+
+PREPARED_BY = (
+    "Prepared by Vanguard Security Services, Designated Agent per "
+    "Security Management Agreement dated February 12, 2026."
+)
+
+CC_LINE = "cc: Jeff Rosenblum, Esq., Legal Counsel"
+
+# Letter columns for delinquent parcels. Read-only against the live DB; the
+# (status, sqft DESC) index kirbygate.py creates serves the filter and order.
+DELINQUENT_FROM = "FROM parcels WHERE status = 'DELINQUENT'"
+DELINQUENT_SQL = f"""SELECT id, sqft, past_due_balance, weekly_rate, business_name,
+       entity_owner, address
+{DELINQUENT_FROM}
+ORDER BY sqft DESC"""
+
 # ── Per-entity contact salutations (correction #7) ─────────────────────────
 # Key = business_name prefix match; value = salutation line
 # Salutations updated per Shelby County Assessor verified owners (Tax Year 2025)
@@ -61,33 +135,42 @@ CONTACT_ADDRESSES = {
 }
 
 
-def get_contact_salutation(business_name):
-    for key, salutation in CONTACTS.items():
-        if business_name.startswith(key):
-            return salutation
-    return "Dear Sir or Madam:"
+# Both tables share the same keys; one anchored alternation finds the first
+# matching prefix (in CONTACTS order) in a single pass.
+_CONTACT_RE = re.compile("|".join(map(re.escape, CONTACTS)))
 
 
-def get_contact_address_block(business_name):
-    for key, addr in CONTACT_ADDRESSES.items():
-        if business_name.startswith(key):
-            return addr
-    return None
+def lookup_contact(business_name):
+    """Return (salutation, address block or None) for a business name."""
+    m = _CONTACT_RE.match(business_name)
+    if m is None:
+        return "Dear Sir or Madam:", None
+    key = m.group()
+    return CONTACTS[key], CONTACT_ADDRESSES.get(key)
 
 
+_MONEY_FMT = "${:,.2f}".format
+
 def money(val):
-    if val is None:
-        return "TBD"
-    return f"${val:,.2f}"
+    return "TBD" if val is None else _MONEY_FMT(val)
 
 
-def build_letter(row):
-    sqft = row["sqft"] or 0
-    pct = sqft / TOTAL_CAMPUS_SQFT
-    past_due = row["past_due_balance"]
-    weekly = row["weekly_rate"] or (CURRENT_WEEKLY_RATE * pct)
-    fwd_monthly = weekly * 4.333
+# ── Letter template ────────────────────────────────────────────────────────
+# The letter is built once with {field} placeholders; each row only fills in
+# its own values. The ADDRESS_BLOCK sentinel paragraph is cloned once per
+# contact address line and ENTITY_LINE is dropped when the parcel has no
+# entity owner.
+ADDRESS_BLOCK = "__ADDR_BLOCK__"
+ENTITY_LINE = "Entity: {entity_owner}"
+
+W_BODY = qn("w:body")
+W_P = qn("w:p")
+W_SECTPR = qn("w:sectPr")
+W_T = qn("w:t")
+XML_SPACE = qn("xml:space")
 
+
+def _build_template():
     doc = Document()
     style = doc.styles["Normal"]
     style.font.name = "Times New Roman"
@@ -120,16 +203,12 @@ def build_letter(row):
     doc.add_paragraph("")
 
     # Correction #7: specific contact address block
-    contact_block = get_contact_address_block(row["business_name"])
-    if contact_block:
-        for line in contact_block.split("\n"):
-            doc.add_paragraph(line)
+    doc.add_paragraph(ADDRESS_BLOCK)
 
     # Correction #4: Remove duplicate RE: — only show property/tenant info
-    doc.add_paragraph(f"Property: {row['address']}")
-    doc.add_paragraph(f"Tenant/Occupant: {row['business_name']}")
-    if row["entity_owner"]:
-        doc.add_paragraph(f"Entity: {row['entity_owner']}")
+    doc.add_paragraph("Property: {address}")
+    doc.add_paragraph("Tenant/Occupant: {business_name}")
+    doc.add_paragraph(ENTITY_LINE)
     doc.add_paragraph("")
 
     # Subject line (single RE:)
@@ -140,16 +219,10 @@ def build_letter(row):
     doc.add_paragraph("")
 
     # ── Correction #7: Specific contact salutation ──
-    salutation = get_contact_salutation(row["business_name"])
-    doc.add_paragraph(salutation)
+    doc.add_paragraph("{salutation}")
     doc.add_paragraph("")
 
-    doc.add_paragraph(
-        "This letter constitutes formal notice that the above-referenced property "
-        "is in material default of the Declaration of Restrictive Covenants recorded "
-        f'on {DECLARATION_DATE} (the "Declaration") governing the Kirby Gate '
-        "commercial development, Memphis, Tennessee."
-    )
+    doc.add_paragraph(DEFAULT_NOTICE)
     doc.add_paragraph("")
 
     # ── Updated designation language ──
@@ -177,21 +250,15 @@ def build_letter(row):
     run = p.add_run("ARREARS CALCULATION:")
     run.bold = True
 
-    doc.add_paragraph(f"  Total Campus Square Footage:     {TOTAL_CAMPUS_SQFT:,} SF")
-    doc.add_paragraph(f"  Your Parcel Square Footage:      {sqft:,} SF")
-    doc.add_paragraph(f"  Your Pro-Rata Share:             {pct:.4%}")
-    doc.add_paragraph(f"  Your Weekly Rate:                {money(weekly)}/week")
+    doc.add_paragraph(f"  Total Campus Square Footage:     {CAMPUS_SQFT_STR} SF")
+    doc.add_paragraph("  Your Parcel Square Footage:      {sqft} SF")
+    doc.add_paragraph("  Your Pro-Rata Share:             {pct}")
+    doc.add_paragraph("  Your Weekly Rate:                {weekly}/week")
     doc.add_paragraph(f"  Arrears Period:                  36 months (156 weeks)")
     doc.add_paragraph("")
 
     p = doc.add_paragraph()
-    if past_due is not None and past_due > 0:
-        run = p.add_run(f"  TOTAL 36-MONTH ARREARS OWED:     {money(past_due)}")
-    else:
-        run = p.add_run(
-            "  TOTAL 36-MONTH ARREARS OWED:     "
-            "TO BE DETERMINED (pending reconciliation)"
-        )
+    run = p.add_run("  TOTAL 36-MONTH ARREARS OWED:     {arrears_owed}")
     run.bold = True
     doc.add_paragraph("")
 
@@ -199,8 +266,8 @@ def build_letter(row):
     p = doc.add_paragraph()
     run = p.add_run("FORWARD BILLING (Effective January 2026):")
     run.bold = True
-    doc.add_paragraph(f"  Current Weekly Rate:             {money(weekly)}/week")
-    doc.add_paragraph(f"  Forward Monthly Amount:          {money(fwd_monthly)}/month")
+    doc.add_paragraph("  Current Weekly Rate:             {weekly}/week")
+    doc.add_paragraph("  Forward Monthly Amount:          {fwd_monthly}/month")
     doc.add_paragraph("")
 
     # ── Correction #6: 30-day cure period ──
@@ -209,71 +276,26 @@ def build_letter(row):
     run.bold = True
 
     # Refinement #6: Bold the cure deadline date within the paragraph
-    if past_due is not None and past_due > 0:
-        p = doc.add_paragraph()
-        p.add_run(
-            "You are hereby notified that you have thirty (30) days from receipt "
-            "of this notice (cure deadline: "
-        )
-        run = p.add_run(CURE_DATE)
-        run.bold = True
-        p.add_run(
-            f") to cure this default by "
-            f"remitting the full arrears balance of {money(past_due)} and establishing "
-            f"forward payment at the rate of {money(fwd_monthly)} per month."
-        )
-    else:
-        p = doc.add_paragraph()
-        p.add_run(
-            "You are hereby notified that you have thirty (30) days from receipt "
-            "of this notice (cure deadline: "
-        )
-        run = p.add_run(CURE_DATE)
-        run.bold = True
-        p.add_run(
-            ") to cure this default by "
-            "contacting us to reconcile the outstanding arrears balance and "
-            f"establishing forward payment at the rate of {money(fwd_monthly)} per month."
-        )
+    p = doc.add_paragraph()
+    p.add_run(
+        "You are hereby notified that you have thirty (30) days from receipt "
+        "of this notice (cure deadline: "
+    )
+    run = p.add_run(CURE_DATE)
+    run.bold = True
+    p.add_run(") to cure this default by {cure_terms}")
 
     doc.add_paragraph("")
-    doc.add_paragraph(
-        "FAILURE TO CURE this default by the cure deadline will result in "
-        "the following actions:"
-    )
-    doc.add_paragraph(
-        "  1. Filing of a Notice of Lien against the property under the "
-        f"Declaration (target date: {LIEN_DEADLINE})"
-    )
-    doc.add_paragraph(
-        "  2. Referral to counsel for enforcement of all rights under the "
-        "Declaration, including recovery of attorneys\u2019 fees and costs "
-        "as provided therein"
-    )
-    doc.add_paragraph(
-        "  3. Notice to senior lenders and title companies of the recorded lien"
-    )
-    # Refinement #3: Fourth failure-to-cure item
-    doc.add_paragraph(
-        "  4. Notification to regulatory agencies, insurance carriers, and "
-        "business partners of the security impairment at the property, as applicable."
-    )
+    doc.add_paragraph(FAILURE_TO_CURE_INTRO)
+    for item in FAILURE_TO_CURE_ITEMS:
+        doc.add_paragraph(item)
     doc.add_paragraph("")
 
     # Legal
-    doc.add_paragraph(
-        "This matter is governed by Tennessee law. The Declaration provides for "
-        "lien rights, fee-shifting, and forum selection in Shelby County, Tennessee. "
-        "The applicable statute of limitations for contract enforcement is six (6) years."
-    )
+    doc.add_paragraph(GOVERNING_LAW)
     doc.add_paragraph("")
     # Refinement #4: Resolution conference language
-    doc.add_paragraph(
-        "We are prepared to discuss a reasonable resolution of the arrears balance, "
-        "including structured payment arrangements, provided forward compliance is "
-        "established immediately. Please contact this office within ten (10) business "
-        "days of receipt to schedule a resolution conference."
-    )
+    doc.add_paragraph(RESOLUTION_CONFERENCE)
     doc.add_paragraph("")
 
     # ── Correction #8: Instrument citation above signature ──
@@ -281,35 +303,235 @@ def build_letter(row):
     doc.add_paragraph("")
 
     # ── Correction #2: New signature block ──
-    doc.add_paragraph("Respectfully,")
-    doc.add_paragraph("")
-    doc.add_paragraph("")
-    doc.add_paragraph("____________________________________")
-    doc.add_paragraph("Walter D. Wills III")
-    doc.add_paragraph("Managing Partner, Wills & Wills LP")
-    doc.add_paragraph("Declarant")
+    for line in SIGNATURE_BLOCK:
+        doc.add_paragraph(line)
     doc.add_paragraph("")
-    doc.add_paragraph(
-        "Prepared by Vanguard Security Services, Designated Agent per "
-        "Security Management Agreement dated February 12, 2026."
-    )
+    doc.add_paragraph(PREPARED_BY)
     doc.add_paragraph("")
 
     # ── Correction #3: Updated cc line ──
-    doc.add_paragraph("cc: Jeff Rosenblum, Esq., Legal Counsel")
+    doc.add_paragraph(CC_LINE)
+
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+TEMPLATE_BYTES = _build_template()
+
+# Every part except the main document is identical across letters, so the
+# template package is unpacked once and each letter only re-serializes
+# word/document.xml before zipping the cached parts back together.
+DOCUMENT_PART = "word/document.xml"
+# Letters are a few KB of XML; fastest deflate costs little in size.
+ZIP_COMPRESSLEVEL = 1
+with zipfile.ZipFile(io.BytesIO(TEMPLATE_BYTES)) as _z:
+    _PARTS = [(name, _z.read(name)) for name in _z.namelist()]
+_TEMPLATE_ROOT = etree.fromstring(dict(_PARTS)[DOCUMENT_PART])
 
-    return doc
+
+def with_rates(rows):
+    """Yield rows with pro-rata share, weekly and forward monthly figures attached."""
+    total = TOTAL_CAMPUS_SQFT
+    current = CURRENT_WEEKLY_RATE
+    for row in rows:
+        sqft = row["sqft"] or 0
+        pct = sqft / total
+        weekly = row["weekly_rate"] or (current * pct)
+        row["pct"] = pct
+        row["weekly"] = weekly
+        row["fwd_monthly"] = weekly * 4.333
+        yield row
+
+
+def letter_context(row):
+    sqft = row["sqft"] or 0
+    pct = row["pct"]
+    past_due = row["past_due_balance"]
+    weekly = row["weekly"]
+    fwd_monthly = row["fwd_monthly"]
+    salutation, contact_block = lookup_contact(row["business_name"])
+    fwd_str = money(fwd_monthly)
+
+    if past_due is not None and past_due > 0:
+        arrears_owed = money(past_due)
+        cure_terms = (
+            f"remitting the full arrears balance of {arrears_owed} and establishing "
+            f"forward payment at the rate of {fwd_str} per month."
+        )
+    else:
+        arrears_owed = "TO BE DETERMINED (pending reconciliation)"
+        cure_terms = (
+            "contacting us to reconcile the outstanding arrears balance and "
+            f"establishing forward payment at the rate of {fwd_str} per month."
+        )
+
+    return {
+        "address_lines": contact_block.split("\n") if contact_block else [],
+        "address": row["address"],
+        "business_name": row["business_name"],
+        "entity_owner": row["entity_owner"],
+        "salutation": salutation,
+        "sqft": f"{sqft:,}",
+        "pct": f"{pct:.4%}",
+        "weekly": money(weekly),
+        "fwd_monthly": fwd_str,
+        "arrears_owed": arrears_owed,
+        "cure_terms": cure_terms,
+    }
+
+
+def _set_text(t, text):
+    """Replace the text of a <w:t> element in place."""
+    t.text = text
+    if text != text.strip():
+        t.set(XML_SPACE, "preserve")
+
+
+def build_letter(row):
+    """Return a filled-in copy of the template's <w:document> element."""
+    ctx = letter_context(row)
+    root = copy.deepcopy(_TEMPLATE_ROOT)
+    body = root.find(W_BODY)
+
+    for p in list(body.iterchildren(W_P)):
+        texts = list(p.iter(W_T))
+        text = "".join(t.text or "" for t in texts)
+        if "{" not in text and text != ADDRESS_BLOCK:
+            continue
+        if text == ADDRESS_BLOCK:
+            for line in ctx["address_lines"]:
+                line_p = copy.deepcopy(p)
+                _set_text(next(line_p.iter(W_T)), line)
+                p.addprevious(line_p)
+            body.remove(p)
+        elif text == ENTITY_LINE and not ctx["entity_owner"]:
+            body.remove(p)
+        else:
+            for t in texts:
+                if t.text and "{" in t.text:
+                    _set_text(t, t.text.format_map(ctx))
+
+    return root
+
+
+def package_letter(root):
+    """Zip a filled-in document element with the cached template parts."""
+    document_xml = etree.tostring(root, encoding="UTF-8", standalone=True)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED,
+                         compresslevel=ZIP_COMPRESSLEVEL) as z:
+        for name, data in _PARTS:
+            z.writestr(name, document_xml if name == DOCUMENT_PART else data)
+    return buf.getvalue()
+
+
+# Filename sanitizing for business names: the table handles the known
+# punctuation, then any other run of unsafe characters or underscores
+# collapses to a single "_".
+_SAFE_TBL = str.maketrans({
+    "/": "-", " ": "_", "'": None, "\u2019": None,
+    "#": None, "(": None, ")": None,
+})
+_SAFE_RE = re.compile(r"(?:[^\w.-]|_)+")
+
+
+def render_letter(row, datestamp):
+    """Build one letter in a worker process; returns (row, filename, docx bytes)."""
+    safe_name = _SAFE_RE.sub("_", row["business_name"].translate(_SAFE_TBL)).strip("_")
+    filename = f"Demand_{safe_name}_{datestamp}.docx"
+    return row, filename, package_letter(build_letter(row))
+
+
+def render_combined(rows, filename):
+    """Write every letter into one document, one letter per page.
+
+    Yields (row, filename) as each letter is appended; the file is saved
+    once the rows are exhausted.
+    """
+    root = copy.deepcopy(_TEMPLATE_ROOT)
+    body = root.find(W_BODY)
+    sect_pr = body.find(W_SECTPR)
+    for p in list(body.iterchildren(W_P)):
+        body.remove(p)
+
+    for i, row in enumerate(rows):
+        if i:
+            page_break = etree.Element(W_P)
+            br = etree.SubElement(etree.SubElement(page_break, qn("w:r")), qn("w:br"))
+            br.set(qn("w:type"), "page")
+            sect_pr.addprevious(page_break)
+        for p in list(build_letter(row).find(W_BODY).iterchildren(W_P)):
+            sect_pr.addprevious(p)
+        yield row, filename
+
+    with open(os.path.join(BASEDIR, filename), "wb") as f:
+        f.write(package_letter(root))
+
+
+def render_separate(rows, datestamp):
+    """Write one letter file per row; yields (row, filename) in row order."""
+    # Letters are independent of each other, so build them in parallel and
+    # hand each finished file to a writer thread while the rest render.
+    q = queue.Queue(maxsize=8)
+    write_errors = []
+    writer = threading.Thread(target=_write_files, args=(q, write_errors))
+    writer.start()
+    try:
+        with ProcessPoolExecutor() as pool:
+            for row, filename, data in pool.map(
+                partial(render_letter, datestamp=datestamp), rows, chunksize=4
+            ):
+                q.put((os.path.join(BASEDIR, filename), data))
+                yield row, filename
+    finally:
+        q.put(None)
+        writer.join()
+    if write_errors:
+        raise write_errors[0]
+
+
+def _write_files(q, errors):
+    """Writer thread: save (path, bytes) items until a None sentinel arrives.
+
+    Failures are collected rather than raised so the queue keeps draining
+    and the producer never blocks on a dead writer.
+    """
+    while True:
+        item = q.get()
+        if item is None:
+            break
+        if errors:
+            continue
+        path, data = item
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            errors.append(e)
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--combined", action="store_true",
+        help="write all letters to one Demands_<date>.docx, one per page",
+    )
+    args = parser.parse_args()
+
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    conn.execute("PRAGMA temp_store=MEMORY")
 
-    rows = conn.execute(
-        "SELECT * FROM parcels WHERE status = 'DELINQUENT' ORDER BY sqft DESC"
-    ).fetchall()
+    count = conn.execute(f"SELECT COUNT(*) {DELINQUENT_FROM}").fetchone()[0]
+    # Rows stream from the cursor as plain dicts so they can be pickled to
+    # the worker processes; nothing holds the whole result set.
+    rows = with_rates(dict(r) for r in conn.execute(DELINQUENT_SQL))
 
-    print(f"  Generating demand letters for {len(rows)} delinquent targets (from live DB)...")
+    print(f"  Generating demand letters for {count} delinquent targets (from live DB)...")
     print()
     print(f"  {'#':>2}  {'Target':<35} {'SqFt':>8} {'% Campus':>9} "
           f"{'Past Due':>14} {'$/Week':>10}  File")
@@ -318,49 +540,56 @@ def main():
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     datestamp = datetime.now().strftime("%Y%m%d")
 
-    for i, row in enumerate(rows, 1):
+    if args.combined:
+        letters = render_combined(rows, f"Demands_{datestamp}.docx")
+    else:
+        letters = render_separate(rows, datestamp)
+
+    log_rows = []
+    report_lines = []
+    for i, (row, filename) in enumerate(letters, 1):
         sqft = row["sqft"] or 0
-        pct = sqft / TOTAL_CAMPUS_SQFT
+        pct = row["pct"]
         past_due = row["past_due_balance"]
         weekly = row["weekly_rate"] or 0
         pd_str = money(past_due) if past_due and past_due > 0 else "TBD"
 
-        doc = build_letter(row)
-
-        safe_name = (row["business_name"]
-                     .replace("/", "-").replace(" ", "_")
-                     .replace("'", "").replace("\u2019", "")
-                     .replace("#", "").replace("(", "").replace(")", ""))
-        filename = f"Demand_{safe_name}_{datestamp}.docx"
-        filepath = os.path.join(BASEDIR, filename)
-        doc.save(filepath)
-
-        # Log in enforcement_log
-        conn.execute(
-            """INSERT INTO enforcement_log
-               (parcel_id, timestamp, action, next_step, attorney, notes)
-               VALUES (?,?,?,?,?,?)""",
+        log_rows.append(
             (row["id"], now, f"Demand letter generated (v4-verified): {filename}",
              "Send via certified mail", "Rosenblum",
-             f"Arrears: {pd_str}, SF: {sqft:,}, 30-day cure"),
+             f"Arrears: {pd_str}, SF: {sqft:,}, 30-day cure")
         )
 
-        print(f"  {i:>2}  {row['business_name']:<35} {sqft:>8,} {pct:>8.4%} "
-              f"{pd_str:>14} {money(weekly):>10}  {filename}")
+        report_lines.append(
+            f"  {i:>2}  {row['business_name']:<35} {sqft:>8,} {pct:>8.4%} "
+            f"{pd_str:>14} {money(weekly):>10}  {filename}"
+        )
 
+    # Log in enforcement_log — one statement, one transaction for the batch
+    conn.execute("BEGIN IMMEDIATE")
+    conn.executemany(
+        """INSERT INTO enforcement_log
+           (parcel_id, timestamp, action, next_step, attorney, notes)
+           VALUES (?,?,?,?,?,?)""",
+        log_rows,
+    )
     conn.commit()
 
-    total_known = sum(
-        r["past_due_balance"] for r in rows
-        if r["past_due_balance"] is not None and r["past_due_balance"] > 0
-    )
-    total_weekly = sum(r["weekly_rate"] or 0 for r in rows)
-    print()
-    print(f"  Total known arrears:   {money(total_known)}")
-    print(f"  Total weekly rate:     {money(total_weekly)}")
-    print(f"  Letters generated:     {len(rows)}")
-    print(f"  Cure period:           30 days (deadline: {CURE_DATE})")
-    print(f"  Saved to:              {BASEDIR}")
+    totals = conn.execute(
+        f"""SELECT COALESCE(SUM(CASE WHEN past_due_balance > 0
+                                     THEN past_due_balance END), 0) AS pd,
+                   COALESCE(SUM(weekly_rate), 0) AS wk
+            {DELINQUENT_FROM}"""
+    ).fetchone()
+    report_lines += [
+        "",
+        f"  Total known arrears:   {money(totals['pd'])}",
+        f"  Total weekly rate:     {money(totals['wk'])}",
+        f"  Letters generated:     {count}",
+        f"  Cure period:           30 days (deadline: {CURE_DATE})",
+        f"  Saved to:              {BASEDIR}",
+    ]
+    sys.stdout.write("\n".join(report_lines) + "\n")
 
     conn.close()
 
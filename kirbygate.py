@@ -5,29 +5,37 @@ Covenant enforcement tracker for 21-parcel, 672,718 SF commercial campus.
 All actions are timestamped and auditable. Runs entirely local on SQLite.
 """
 
-import csv
+import copy
+import io
 import os
 import sqlite3
 import sys
-import textwrap
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import chain
 
 # Force UTF-8 output on Windows
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+    os.system("")  # enables ANSI escape processing in cmd.exe for clear()
 
-DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kirbygate.db")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "kirbygate.db")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS
 # ═══════════════════════════════════════════════════════════════════════════════
 
 TOTAL_CAMPUS_SQFT = 672_718
+_INV_CAMPUS_SQFT = 1.0 / TOTAL_CAMPUS_SQFT  # letter share: multiply, not divide
 HISTORIC_WEEKLY_RATE = 6_069.52   # pre-Jan 2026
 CURRENT_WEEKLY_RATE  = 9_000.00   # Jan 2026+
 ARREARS_WEEKS = 156               # 36 months
 LIEN_DEADLINE = "2026-04-01"
+LIEN_DEADLINE_DT = datetime.fromisoformat(LIEN_DEADLINE)   # parsed once
+LIEN_DEADLINE_DATE = LIEN_DEADLINE_DT.date()
 CURE_PERIOD_DAYS = 15
 DECLARATION_DATE = "2011-05-05"
 
@@ -37,12 +45,30 @@ VALID_STEPS = [
     "In Negotiation", "Settlement Agreed", "Lien Filed",
     "Attorney Letter Received", "Research", "Resolved"
 ]
+SENT_VIA_CHOICES = {"1": "USPS Certified", "2": "Email", "3": "Hand-delivered",
+                    "4": "FedEx/UPS", "5": "Attorney (Rosenblum)", "6": ""}
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATABASE SETUP
 # ═══════════════════════════════════════════════════════════════════════════════
 
-SCHEMA = """
+# Bump when SCHEMA, ensure_deadline_columns or the rate constants baked into
+# ECON_VIEW_SELECT change; the view is only rebuilt on a version change
+CURRENT_SCHEMA_VERSION = 4
+
+# Effective arrears/weekly per parcel: stored value when set, otherwise the
+# pro-rata figure (same rules and operation order as get_arrears/get_weekly)
+ECON_VIEW_SELECT = f"""SELECT *,
+       COALESCE(sqft, 0) * 1.0 / {TOTAL_CAMPUS_SQFT} AS pct_calc,
+       COALESCE(NULLIF(weekly_rate, 0),
+           {CURRENT_WEEKLY_RATE} * (COALESCE(sqft, 0) * 1.0 / {TOTAL_CAMPUS_SQFT})) AS eff_weekly,
+       COALESCE(NULLIF(past_due_balance, 0),
+           CASE WHEN status IN ('DELINQUENT','DISPUTED','RECON')
+                THEN {HISTORIC_WEEKLY_RATE} * (COALESCE(sqft, 0) * 1.0 / {TOTAL_CAMPUS_SQFT}) * {ARREARS_WEEKS}
+                ELSE 0 END) AS eff_arrears
+FROM parcels"""
+
+SCHEMA = f"""
 CREATE TABLE IF NOT EXISTS parcels (
     id                INTEGER PRIMARY KEY AUTOINCREMENT,
     address           TEXT NOT NULL,
@@ -96,6 +122,23 @@ CREATE TABLE IF NOT EXISTS rates (
     value           REAL,
     effective_date  TEXT
 );
+
+-- (status, sqft DESC) serves status filters and the sqft-ordered listings;
+-- it replaces the single-column status index
+DROP INDEX IF EXISTS idx_parcels_status;
+-- Superseded: the lender picker is served by idx_parcels_status_sqft, and
+-- idx_delinq was left behind on live databases by earlier gen_demands.py runs
+DROP INDEX IF EXISTS idx_parcels_lender;
+DROP INDEX IF EXISTS idx_delinq;
+DROP VIEW IF EXISTS delinquent_parcels;
+CREATE INDEX IF NOT EXISTS idx_parcels_status_sqft ON parcels(status, sqft DESC);
+CREATE INDEX IF NOT EXISTS idx_log_parcel ON enforcement_log(parcel_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_log_ts ON enforcement_log(timestamp);
+CREATE INDEX IF NOT EXISTS idx_parcels_deadline ON parcels(deadline)
+    WHERE deadline IS NOT NULL AND deadline != '';
+
+-- Effective arrears/weekly per parcel (see ECON_VIEW_SELECT)
+CREATE VIEW IF NOT EXISTS v_parcels_econ AS {ECON_VIEW_SELECT};
 """
 
 SEED_PARCELS = [
@@ -139,6 +182,38 @@ SEED_LOG = [
 ]
 
 
+# Shared query text for the per-parcel lookup used by most menus; one string
+# means one entry in the connection's prepared-statement cache.
+SQL_GET_PARCEL = "SELECT * FROM parcels WHERE id = ?"
+
+
+def insert_rows(conn, insert_head, rows):
+    """Insert equal-width rows with a single multi-row VALUES statement."""
+    group = "(" + ",".join("?" * len(rows[0])) + ")"
+    conn.execute(
+        f"{insert_head} VALUES {','.join([group] * len(rows))}",
+        list(chain.from_iterable(rows)),
+    )
+
+
+LOG_INSERT_SQL = """INSERT INTO enforcement_log
+    (parcel_id, timestamp, action, sent_via, next_step, attorney, notes)
+    VALUES (?,?,?,?,?,?,?)"""
+
+
+def log_actions(conn, entries):
+    """Write a batch of enforcement_log rows with one executemany and one commit."""
+    with conn:
+        conn.executemany(LOG_INSERT_SQL, entries)
+
+
+def fetch_tuples(conn, sql, params=()):
+    """Run a query on a cursor that yields plain tuples rather than sqlite3.Row."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur.execute(sql, params)
+
+
 def ensure_deadline_columns(conn):
     """Add deadline-tracking columns to existing databases that lack them."""
     existing = {row[1] for row in conn.execute("PRAGMA table_info(parcels)").fetchall()}
@@ -159,58 +234,71 @@ def ensure_deadline_columns(conn):
         ("address_verified", "INTEGER DEFAULT 0"),
         ("lender_verified", "INTEGER DEFAULT 0"),
     ]
-    for col_name, col_type in new_cols:
-        if col_name not in existing:
+    missing = [(n, t) for n, t in new_cols if n not in existing]
+    if not missing:
+        return
+    # sqlite3 does not open a transaction for DDL on its own
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for col_name, col_type in missing:
             conn.execute(f"ALTER TABLE parcels ADD COLUMN {col_name} {col_type}")
-    conn.commit()
 
 
 def get_db():
     """Open and optionally initialize the database."""
     fresh = not os.path.exists(DB_PATH)
-    conn = sqlite3.connect(DB_PATH)
+    # Room for every distinct query the menus issue, so none are re-prepared
+    conn = sqlite3.connect(DB_PATH, cached_statements=128)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
-    for stmt in SCHEMA.split(";"):
-        stmt = stmt.strip()
-        if stmt:
-            conn.execute(stmt)
-    conn.commit()
-
-    # Migrate existing DBs to add deadline columns
-    if not fresh:
-        ensure_deadline_columns(conn)
+    # WAL is persistent in the file; only switch when it is not already set
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -20000")      # ~20 MB page cache
+    conn.execute("PRAGMA mmap_size = 268435456")    # 256 MB
+    conn.executescript(SCHEMA)
+
+    # Migrate existing DBs to add deadline columns; user_version records
+    # that the migration has run so later opens skip the table_info probe
+    migrated = conn.execute("PRAGMA user_version").fetchone()[0] != CURRENT_SCHEMA_VERSION
+    if migrated:
+        if not fresh:
+            ensure_deadline_columns(conn)
+        # Pick up any change to the constants baked into the view text
+        conn.executescript(f"""DROP VIEW IF EXISTS v_parcels_econ;
+CREATE VIEW v_parcels_econ AS {ECON_VIEW_SELECT};""")
+        conn.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}")
 
     if fresh:
-        # Seed parcels
-        for p in SEED_PARCELS:
-            sqft = p[2]
-            pct = sqft / TOTAL_CAMPUS_SQFT
-            conn.execute(
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # One transaction and one INSERT statement per table for the seed
+        with conn:
+            insert_rows(
+                conn,
                 """INSERT INTO parcels
                    (address, business_name, sqft, pct_campus, status,
                     entity_owner, corporate_target, enforcement_step,
-                    next_action, deadline, notes)
-                   VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
-                (p[0], p[1], sqft, pct, p[3], p[4], p[5], p[6], p[7], p[8], p[9]),
+                    next_action, deadline, notes)""",
+                [(p[0], p[1], p[2], p[2] / TOTAL_CAMPUS_SQFT, *p[3:])
+                 for p in SEED_PARCELS],
             )
-        # Seed rates
-        for r in SEED_RATES:
-            conn.execute(
-                "INSERT INTO rates (label, value, effective_date) VALUES (?,?,?)", r
+            insert_rows(
+                conn, "INSERT INTO rates (label, value, effective_date)", SEED_RATES,
             )
-        # Seed enforcement log
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        for entry in SEED_LOG:
-            conn.execute(
+            insert_rows(
+                conn,
                 """INSERT INTO enforcement_log
                    (parcel_id, timestamp, action, sent_via, response_due,
-                    response_received, next_step, attorney, cost, notes)
-                   VALUES (?,?,?,?,?,?,?,?,?,?)""",
-                (entry[0], now, entry[1], entry[2], entry[3],
-                 entry[4], entry[5], entry[6], entry[7], entry[8]),
+                    response_received, next_step, attorney, cost, notes)""",
+                [(e[0], now, *e[1:]) for e in SEED_LOG],
             )
-        conn.commit()
+
+    # Refresh planner statistics once per schema version, after any seeding
+    if migrated:
+        conn.execute("ANALYZE")
+
     return conn
 
 
@@ -221,43 +309,97 @@ def get_db():
 def calc_pct(sqft):
     return sqft / TOTAL_CAMPUS_SQFT
 
+# The helpers below inline the pro-rata share instead of chaining calls;
+# the operation order is kept so results are bit-for-bit unchanged. They
+# depend only on sqft and module constants, so results are memoized.
+@lru_cache(maxsize=128)
 def calc_historic_weekly(sqft):
-    return HISTORIC_WEEKLY_RATE * calc_pct(sqft)
+    return HISTORIC_WEEKLY_RATE * (sqft / TOTAL_CAMPUS_SQFT)
 
+@lru_cache(maxsize=128)
 def calc_current_weekly(sqft):
-    return CURRENT_WEEKLY_RATE * calc_pct(sqft)
+    return CURRENT_WEEKLY_RATE * (sqft / TOTAL_CAMPUS_SQFT)
 
+@lru_cache(maxsize=128)
 def calc_arrears_36mo(sqft):
-    return calc_historic_weekly(sqft) * ARREARS_WEEKS
+    return HISTORIC_WEEKLY_RATE * (sqft / TOTAL_CAMPUS_SQFT) * ARREARS_WEEKS
 
+@lru_cache(maxsize=128)
 def calc_forward_monthly(sqft):
-    return calc_current_weekly(sqft) * 4.333
+    return CURRENT_WEEKLY_RATE * (sqft / TOTAL_CAMPUS_SQFT) * 4.333
+
+@lru_cache(maxsize=512)
+def _arrears(past_due_balance, status, sqft):
+    if past_due_balance is not None and past_due_balance != 0:
+        return past_due_balance
+    if status in ("DELINQUENT", "DISPUTED", "RECON"):
+        return calc_arrears_36mo(sqft)
+    return 0
+
+@lru_cache(maxsize=512)
+def _weekly(weekly_rate, sqft):
+    if weekly_rate is not None and weekly_rate != 0:
+        return weekly_rate
+    return calc_current_weekly(sqft)
 
 def get_arrears(row):
     """Return stored past_due_balance if set, otherwise calculate from sqft."""
-    if row["past_due_balance"] is not None and row["past_due_balance"] != 0:
-        return row["past_due_balance"]
-    if row["status"] in ("DELINQUENT", "DISPUTED", "RECON"):
-        return calc_arrears_36mo(row["sqft"] or 0)
-    return 0
+    return _arrears(row["past_due_balance"], row["status"], row["sqft"] or 0)
 
 def get_weekly(row):
     """Return stored weekly_rate if set, otherwise calculate from sqft."""
-    if row["weekly_rate"] is not None and row["weekly_rate"] != 0:
-        return row["weekly_rate"]
-    return calc_current_weekly(row["sqft"] or 0)
+    return _weekly(row["weekly_rate"], row["sqft"] or 0)
 
 def get_forward_monthly(row):
     """Forward monthly from stored weekly rate or calculated."""
     return get_weekly(row) * 4.333
 
+@lru_cache(maxsize=256)
+def _deadline_dates(date_sent_str):
+    sent = date.fromisoformat(date_sent_str)
+    return (
+        (sent + timedelta(days=30)).isoformat(),
+        (sent + timedelta(days=45)).isoformat(),
+        (sent + timedelta(days=60)).isoformat(),
+    )
+
+# Column totals over v_parcels_econ; append a WHERE clause as needed.
+PARCEL_TOTALS_SQL = """
+SELECT COALESCE(SUM(sqft), 0) AS total_sqft,
+       COALESCE(SUM(eff_arrears), 0) AS total_arrears,
+       COALESCE(SUM(eff_weekly), 0) AS total_weekly,
+       COALESCE(SUM(eff_weekly * 4.333), 0) AS total_monthly
+FROM v_parcels_econ"""
+
+# Per-status counts and sums for the dashboard; VERIFY is reported with RECON.
+DASHBOARD_BUCKETS_SQL = """
+SELECT CASE status WHEN 'VERIFY' THEN 'RECON' ELSE status END AS bucket,
+       COUNT(*), COALESCE(SUM(eff_arrears), 0), COALESCE(SUM(eff_weekly), 0)
+FROM v_parcels_econ
+GROUP BY bucket"""
+
+def parcel_totals(conn, where=""):
+    """Return one row of sqft/arrears/weekly/monthly totals over parcels."""
+    return conn.execute(PARCEL_TOTALS_SQL + where).fetchone()
+
+@lru_cache(maxsize=4096)
+def parse_iso(s):
+    """Return the day ordinal of an isoformat() YYYY-MM-DD string; memoized."""
+    return date(int(s[0:4]), int(s[5:7]), int(s[8:10])).toordinal()
+
+def _ts(dt):
+    """Format a datetime as a YYYY-MM-DD HH:MM:SS log timestamp (no strftime)."""
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}")
+
 def calc_deadlines(date_sent_str):
     """Given a packet sent date (YYYY-MM-DD), return cure/lien/attorney dates."""
-    sent = datetime.strptime(date_sent_str, "%Y-%m-%d")
+    # Parsed once per distinct date; callers get a fresh dict they may modify
+    cure, lien, attorney = _deadline_dates(date_sent_str)
     return {
-        "cure_deadline": (sent + timedelta(days=30)).strftime("%Y-%m-%d"),
-        "lien_filing_date": (sent + timedelta(days=45)).strftime("%Y-%m-%d"),
-        "attorney_referral_date": (sent + timedelta(days=60)).strftime("%Y-%m-%d"),
+        "cure_deadline": cure,
+        "lien_filing_date": lien,
+        "attorney_referral_date": attorney,
     }
 
 def set_packet_sent(conn, parcel_id, date_sent_str, tracking_number=None):
@@ -320,30 +462,34 @@ def calc_settlement(principal, discount_pct, interest_rate, term_months):
 # DISPLAY HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+_MONEY_FMT = "${:,.2f}".format
+
 def money(val):
-    if val is None or val == 0:
-        return "—"
-    return f"${val:,.2f}"
+    return "—" if not val else _MONEY_FMT(val)
 
 def trunc(text, width):
     if text is None or text == "":
         return "—"
-    text = str(text)
+    if not isinstance(text, str):
+        text = str(text)
     return text if len(text) <= width else text[: width - 1] + "~"
 
+STATUS_MARKERS = {
+    "CURRENT": "[OK]",
+    "DELINQUENT": "[!!]",
+    "DISPUTED": "[??]",
+    "RECON": "[RR]",
+    "VERIFY": "[VV]",
+    "SETTLED": "[$$]",
+}
+
 def status_marker(status):
-    markers = {
-        "CURRENT": "[OK]",
-        "DELINQUENT": "[!!]",
-        "DISPUTED": "[??]",
-        "RECON": "[RR]",
-        "VERIFY": "[VV]",
-        "SETTLED": "[$$]",
-    }
-    return markers.get(status, "[  ]")
+    return STATUS_MARKERS.get(status, "[  ]")
 
 def clear():
-    os.system("cls" if os.name == "nt" else "clear")
+    # Same sequence `clear` emits: home, erase screen, erase scrollback
+    sys.stdout.write("\x1b[H\x1b[2J\x1b[3J")
+    sys.stdout.flush()
 
 def pause():
     input("\n  Press Enter to continue...")
@@ -362,7 +508,11 @@ def header(title):
 
 def view_all_parcels(conn):
     header("ALL PARCELS (21)")
-    rows = conn.execute("SELECT * FROM parcels ORDER BY status, id").fetchall()
+    rows = conn.execute(
+        """SELECT id, status, address, business_name, sqft, pct_campus,
+                  eff_arrears, eff_weekly, enforcement_step, deadline
+           FROM v_parcels_econ ORDER BY status, id"""
+    ).fetchall()
 
     hdr = (
         f"{'ID':>3} {'Stat':>5} {'Address':<24} {'Business':<28} "
@@ -373,27 +523,20 @@ def view_all_parcels(conn):
     print(f"  {hdr}")
     print(sep)
 
-    total_sqft = 0
-    total_arrears = 0
-    for r in rows:
-        sqft = r["sqft"] or 0
-        pct = r["pct_campus"] or 0
-        arrears = get_arrears(r)
-        wkly = get_weekly(r)
-        total_sqft += sqft
-        total_arrears += arrears
-
-        line = (
-            f"{r['id']:>3} {status_marker(r['status']):>5} "
-            f"{trunc(r['address'], 24):<24} {trunc(r['business_name'], 28):<28} "
-            f"{sqft:>7,} {pct:>5.1%} {money(arrears):>14} {money(wkly):>10} "
-            f"{trunc(r['enforcement_step'], 16):<16} {trunc(r['deadline'], 11):<11}"
-        )
-        print(f"  {line}")
+    fmt = ("  {:>3} {:>5} {:<24} {:<28} {:>7,} {:>5.1%} {:>14} {:>10} "
+           "{:<16} {:<11}\n").format
+    lines = [
+        fmt(pid, status_marker(status), trunc(address, 24), trunc(business, 28),
+            sqft or 0, pct or 0, money(arrears), money(wkly),
+            trunc(step, 16), trunc(deadline, 11))
+        for pid, status, address, business, sqft, pct, arrears, wkly, step, deadline in rows
+    ]
+    sys.stdout.write("".join(lines))
 
+    totals = parcel_totals(conn)
     print(sep)
-    print(f"  {'':>3} {'':>5} {'TOTALS':<24} {'':28} {total_sqft:>7,} "
-          f"{'':>6} {money(total_arrears):>14}")
+    print(f"  {'':>3} {'':>5} {'TOTALS':<24} {'':28} {totals['total_sqft']:>7,} "
+          f"{'':>6} {money(totals['total_arrears']):>14}")
     print()
     print(f"  Legend:  [OK] Current   [!!] Delinquent   [??] Disputed   [RR] Recon   [VV] Verify   [$$] Settled")
     pause()
@@ -405,8 +548,11 @@ def view_all_parcels(conn):
 
 def view_nonpayers(conn):
     header("NON-PAYERS (Delinquent / Disputed / Recon)")
+    # Rows and totals both come from v_parcels_econ so they always agree
     rows = conn.execute(
-        "SELECT * FROM parcels WHERE status IN ('DELINQUENT','DISPUTED','RECON') ORDER BY sqft DESC"
+        """SELECT id, address, business_name, sqft, eff_arrears, eff_weekly, corporate_target
+           FROM v_parcels_econ WHERE status IN ('DELINQUENT','DISPUTED','RECON')
+           ORDER BY sqft DESC"""
     ).fetchall()
 
     if not rows:
@@ -414,35 +560,29 @@ def view_nonpayers(conn):
         pause()
         return
 
-    total_arrears = 0
-    total_weekly = 0
-    total_monthly = 0
     print(f"  {'ID':>3} {'Address':<24} {'Business':<28} {'SqFt':>7} "
           f"{'36-Mo Arrears':>14} {'Wkly Now':>10} {'Fwd Mo':>10} "
           f"{'Corporate Target':<30}")
     print("  " + "-" * 130)
 
-    for r in rows:
-        sqft = r["sqft"] or 0
-        arrears = get_arrears(r)
-        wkly = get_weekly(r)
-        mo = get_forward_monthly(r)
-        total_arrears += arrears
-        total_weekly += wkly
-        total_monthly += mo
-
-        print(f"  {r['id']:>3} {trunc(r['address'], 24):<24} "
-              f"{trunc(r['business_name'], 28):<28} {sqft:>7,} "
-              f"{money(arrears):>14} {money(wkly):>10} {money(mo):>10} "
-              f"{trunc(r['corporate_target'], 30):<30}")
+    fmt = "  {:>3} {:<24} {:<28} {:>7,} {:>14} {:>10} {:>10} {:<30}\n".format
+    lines = [
+        fmt(pid, trunc(address, 24), trunc(business, 28), sqft or 0,
+            money(arrears), money(wkly), money(wkly * 4.333), trunc(target, 30))
+        for pid, address, business, sqft, arrears, wkly, target in rows
+    ]
+    sys.stdout.write("".join(lines))
 
+    totals = parcel_totals(
+        conn, " WHERE status IN ('DELINQUENT','DISPUTED','RECON')")
     print("  " + "-" * 130)
     print(f"  {'':>3} {'TOTALS':<24} {'':28} {'':>7} "
-          f"{money(total_arrears):>14} {money(total_weekly):>10} {money(total_monthly):>10}")
+          f"{money(totals['total_arrears']):>14} {money(totals['total_weekly']):>10} "
+          f"{money(totals['total_monthly']):>10}")
     print()
     print(f"  Non-payer count: {len(rows)}")
     print(f"  Lien deadline:   {LIEN_DEADLINE}")
-    days_left = (datetime.strptime(LIEN_DEADLINE, "%Y-%m-%d") - datetime.now()).days
+    days_left = (LIEN_DEADLINE_DT - datetime.now()).days
     print(f"  Days remaining:  {days_left}")
     pause()
 
@@ -468,7 +608,7 @@ def update_parcel(conn):
         pause()
         return
 
-    row = conn.execute("SELECT * FROM parcels WHERE id = ?", (pid,)).fetchone()
+    row = conn.execute(SQL_GET_PARCEL, (pid,)).fetchone()
     if not row:
         print(f"  No parcel with ID {pid}.")
         pause()
@@ -634,9 +774,7 @@ def log_enforcement(conn):
     print("    5. Attorney (Rosenblum)")
     print("    6. N/A")
     sent_choice = input("  Choice: ").strip()
-    sent_map = {"1": "USPS Certified", "2": "Email", "3": "Hand-delivered",
-                "4": "FedEx/UPS", "5": "Attorney (Rosenblum)", "6": ""}
-    sent_via = sent_map.get(sent_choice, sent_choice)
+    sent_via = SENT_VIA_CHOICES.get(sent_choice, sent_choice)
 
     response_due = input("  Response due date (YYYY-MM-DD, or Enter to skip): ").strip()
     next_step = input("  Next step: ").strip()
@@ -671,18 +809,119 @@ def log_enforcement(conn):
 # MENU 5: GENERATE DEMAND LETTER
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def generate_demand_letter(conn):
-    header("GENERATE DEMAND LETTER")
+# Character data escaping for _w_p; a translate table avoids importing
+# xml.sax.saxutils, which pulls in urllib at startup
+_XML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
 
+# Filename-safe business/lender names for saved letters
+_SAFE_TRANS = str.maketrans({"/": "-", " ": "_"})
+
+@lru_cache(maxsize=1)
+def _docx():
+    """Import python-docx once, on first use; None if it is not installed."""
     try:
         from docx import Document
-        from docx.shared import Pt, Inches
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.oxml import parse_xml
+        from docx.oxml.ns import nsdecls
+        from docx.shared import Pt
     except ImportError:
+        return None
+    return Document, Pt, parse_xml, nsdecls
+
+def _w_p(text="", bold=False, underline=False, size=None, center=False):
+    """Return WordprocessingML for a paragraph holding one optional run."""
+    ppr = '<w:pPr><w:jc w:val="center"/></w:pPr>' if center else ""
+    if not text:
+        return f"<w:p>{ppr}</w:p>"
+    rpr = ("<w:b/>" if bold else "") + ('<w:u w:val="single"/>' if underline else "")
+    if size:
+        rpr += f'<w:sz w:val="{size}"/>'  # half-points
+    if rpr:
+        rpr = f"<w:rPr>{rpr}</w:rPr>"
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f"<w:p>{ppr}<w:r>{rpr}<w:t{space}>{text.translate(_XML_ESCAPES)}</w:t></w:r></w:p>"
+
+def _append_body_xml(doc, paragraphs_xml):
+    """Parse paragraph XML once and insert it ahead of the section properties."""
+    _, _, parse_xml, nsdecls = _docx()
+    frag = parse_xml(f"<w:body {nsdecls('w')}>{paragraphs_xml}</w:body>")
+    sect_pr = doc.element.body.sectPr
+    for p in list(frag):
+        sect_pr.addprevious(p)
+
+def _save_docx(doc, filepath):
+    """Zip the document in memory, then write the file in a single call."""
+    buf = io.BytesIO()
+    doc.save(buf)
+    with open(filepath, "wb") as f:
+        f.write(buf.getbuffer())
+
+# Demand letter body from the subject line to the cc, rendered to XML once at
+# import; each letter only fills the {placeholders} with str.format.
+DEMAND_BODY_XML = "".join([
+    _w_p("RE: NOTICE OF COVENANT NON-COMPLIANCE AND DEMAND FOR CURE",
+         bold=True, underline=True),
+    _w_p(),
+    _w_p("Dear Sir or Madam:"),
+    _w_p(),
+    _w_p(f"This letter constitutes formal notice that the above-referenced property is in material "
+         f"default of the Declaration of Restrictive Covenants recorded on {DECLARATION_DATE} "
+         f"(the \"Declaration\") governing the Kirby Gate commercial development, Memphis, Tennessee."),
+    _w_p(),
+    _w_p("Pursuant to the Declaration, each parcel owner is obligated to fund its pro-rata share of "
+         "campus-wide security services. Vanguard Security Services has been designated as the "
+         "authorized security provider under the Declaration, as confirmed by the Wills designation letter."),
+    _w_p(),
+    _w_p("ARREARS CALCULATION:", bold=True),
+    _w_p(f"  Total Campus Square Footage:   {TOTAL_CAMPUS_SQFT:,} SF"),
+    _w_p("  Your Parcel Square Footage:    {sqft} SF"),
+    _w_p("  Your Pro-Rata Share:           {pct}"),
+    _w_p("  Your Weekly Rate:              {weekly}/week"),
+    _w_p(f"  Arrears Period:                {ARREARS_WEEKS} weeks (36 months)"),
+    _w_p(),
+    _w_p("  TOTAL 36-MONTH ARREARS OWED:   {arrears_owed}", bold=True),
+    _w_p(),
+    _w_p("FORWARD BILLING (Effective January 2026):", bold=True),
+    _w_p("  Current Weekly Rate:           {weekly}/week"),
+    _w_p("  Forward Monthly Amount:        {fwd_monthly}/month"),
+    _w_p(),
+    _w_p("DEMAND FOR CURE:", bold=True),
+    _w_p("You are hereby notified that you have fifteen (15) days from receipt of this notice "
+         "(cure deadline: {cure_date}) to cure this default by remitting the full arrears "
+         "balance of {arrears} and establishing forward payment at the rate of "
+         "{fwd_monthly} per month."),
+    _w_p(),
+    _w_p("FAILURE TO CURE this default by the cure deadline will result in the following actions:"),
+    _w_p(f"  1. Filing of a Notice of Lien against the property under the Declaration (target date: {LIEN_DEADLINE})"),
+    _w_p("  2. Referral to counsel for enforcement of all rights under the Declaration, "
+         "including recovery of attorneys' fees and costs as provided therein"),
+    _w_p("  3. Notice to senior lenders and title companies of the recorded lien"),
+    _w_p(),
+    _w_p("This matter is governed by Tennessee law. The Declaration provides for lien rights, "
+         "fee-shifting, and forum selection in Shelby County, Tennessee. The applicable statute "
+         "of limitations for contract enforcement is six (6) years."),
+    _w_p(),
+    _w_p("We encourage you to contact us promptly to discuss resolution of this matter."),
+    _w_p(),
+    _w_p("Respectfully,"),
+    _w_p(), _w_p(),
+    _w_p("____________________________________"),
+    _w_p("Brad"),
+    _w_p("Vanguard Security Services"),
+    _w_p(),
+    _w_p("cc: Rosenblum (Counsel)"),
+])
+
+def generate_demand_letter(conn):
+    header("GENERATE DEMAND LETTER")
+
+    docx = _docx()
+    if docx is None:
         print("  Error: python-docx is not installed.")
         print("  Run: pip install python-docx")
         pause()
         return
+    Document, Pt = docx[:2]
 
     pid = input("  Parcel ID (or 'list' to see non-payers): ").strip()
     if pid.lower() == "list":
@@ -701,7 +940,7 @@ def generate_demand_letter(conn):
         pause()
         return
 
-    row = conn.execute("SELECT * FROM parcels WHERE id = ?", (pid,)).fetchone()
+    row = conn.execute(SQL_GET_PARCEL, (pid,)).fetchone()
     if not row:
         print(f"  No parcel with ID {pid}.")
         pause()
@@ -712,8 +951,9 @@ def generate_demand_letter(conn):
     arrears = get_arrears(row)
     curr_wkly = get_weekly(row)
     fwd_monthly = get_forward_monthly(row)
-    today = datetime.now().strftime("%B %d, %Y")
-    cure_date = (datetime.now() + timedelta(days=CURE_PERIOD_DAYS)).strftime("%B %d, %Y")
+    _now = datetime.now()
+    today = _now.strftime("%B %d, %Y")
+    cure_date = (_now + timedelta(days=CURE_PERIOD_DAYS)).strftime("%B %d, %Y")
 
     doc = Document()
 
@@ -723,144 +963,48 @@ def generate_demand_letter(conn):
     font.name = "Times New Roman"
     font.size = Pt(12)
 
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run("VANGUARD SECURITY SERVICES / ARS")
-    run.bold = True
-    run.font.size = Pt(14)
-
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.add_run("[Letterhead — Address / Phone / Email]")
-
-    doc.add_paragraph("")
-    doc.add_paragraph(today)
-    doc.add_paragraph("")
+    # The whole body is assembled as one WordprocessingML string and parsed
+    # once, instead of ~60 add_paragraph/add_run calls.
+    P = _w_p
+    parts = [
+        P("VANGUARD SECURITY SERVICES / ARS", bold=True, size=28, center=True),
+        P("[Letterhead — Address / Phone / Email]", center=True),
+        P(), P(today), P(),
+    ]
 
     # Addressee
     if row["corporate_target"]:
-        doc.add_paragraph(f"SENT VIA CERTIFIED MAIL")
-        doc.add_paragraph("")
-        doc.add_paragraph(f"{row['corporate_target']}")
+        parts += [P("SENT VIA CERTIFIED MAIL"), P(), P(f"{row['corporate_target']}")]
     if row["entity_owner"]:
-        doc.add_paragraph(f"RE: {row['entity_owner']}")
-    doc.add_paragraph(f"Property: {row['address']}")
-    doc.add_paragraph(f"Tenant/Occupant: {row['business_name']}")
-    doc.add_paragraph("")
-
-    # Subject
-    p = doc.add_paragraph()
-    run = p.add_run("RE: NOTICE OF COVENANT NON-COMPLIANCE AND DEMAND FOR CURE")
-    run.bold = True
-    run.underline = True
-    doc.add_paragraph("")
-
-    # Body
-    doc.add_paragraph(
-        f"Dear Sir or Madam:"
-    )
-    doc.add_paragraph("")
-    doc.add_paragraph(
-        f"This letter constitutes formal notice that the above-referenced property is in material "
-        f"default of the Declaration of Restrictive Covenants recorded on {DECLARATION_DATE} "
-        f"(the \"Declaration\") governing the Kirby Gate commercial development, Memphis, Tennessee."
-    )
-    doc.add_paragraph("")
-    doc.add_paragraph(
-        f"Pursuant to the Declaration, each parcel owner is obligated to fund its pro-rata share of "
-        f"campus-wide security services. Vanguard Security Services has been designated as the "
-        f"authorized security provider under the Declaration, as confirmed by the Wills designation letter."
-    )
-    doc.add_paragraph("")
-
-    # Calculation breakdown
-    p = doc.add_paragraph()
-    run = p.add_run("ARREARS CALCULATION:")
-    run.bold = True
-
-    doc.add_paragraph(f"  Total Campus Square Footage:   {TOTAL_CAMPUS_SQFT:,} SF")
-    doc.add_paragraph(f"  Your Parcel Square Footage:    {sqft:,} SF")
-    doc.add_paragraph(f"  Your Pro-Rata Share:           {pct:.4%}")
-    doc.add_paragraph(f"  Your Weekly Rate:              {money(curr_wkly)}/week")
-    doc.add_paragraph(f"  Arrears Period:                {ARREARS_WEEKS} weeks (36 months)")
-    doc.add_paragraph("")
-
-    p = doc.add_paragraph()
-    if arrears:
-        run = p.add_run(f"  TOTAL 36-MONTH ARREARS OWED:   {money(arrears)}")
-    else:
-        run = p.add_run("  TOTAL 36-MONTH ARREARS OWED:   TO BE DETERMINED (pending reconciliation)")
-    run.bold = True
-    doc.add_paragraph("")
-
-    p = doc.add_paragraph()
-    run = p.add_run("FORWARD BILLING (Effective January 2026):")
-    run.bold = True
-    doc.add_paragraph(f"  Current Weekly Rate:           {money(curr_wkly)}/week")
-    doc.add_paragraph(f"  Forward Monthly Amount:        {money(fwd_monthly)}/month")
-    doc.add_paragraph("")
-
-    # Demand
-    p = doc.add_paragraph()
-    run = p.add_run("DEMAND FOR CURE:")
-    run.bold = True
-    doc.add_paragraph(
-        f"You are hereby notified that you have fifteen (15) days from receipt of this notice "
-        f"(cure deadline: {cure_date}) to cure this default by remitting the full arrears "
-        f"balance of {money(arrears)} and establishing forward payment at the rate of "
-        f"{money(fwd_monthly)} per month."
-    )
-    doc.add_paragraph("")
-    doc.add_paragraph(
-        f"FAILURE TO CURE this default by the cure deadline will result in the following actions:"
-    )
-    doc.add_paragraph(
-        f"  1. Filing of a Notice of Lien against the property under the Declaration (target date: {LIEN_DEADLINE})"
-    )
-    doc.add_paragraph(
-        f"  2. Referral to counsel for enforcement of all rights under the Declaration, "
-        f"including recovery of attorneys' fees and costs as provided therein"
-    )
-    doc.add_paragraph(
-        f"  3. Notice to senior lenders and title companies of the recorded lien"
-    )
-    doc.add_paragraph("")
-
-    doc.add_paragraph(
-        f"This matter is governed by Tennessee law. The Declaration provides for lien rights, "
-        f"fee-shifting, and forum selection in Shelby County, Tennessee. The applicable statute "
-        f"of limitations for contract enforcement is six (6) years."
-    )
-    doc.add_paragraph("")
-    doc.add_paragraph(
-        f"We encourage you to contact us promptly to discuss resolution of this matter."
-    )
-    doc.add_paragraph("")
-    doc.add_paragraph("Respectfully,")
-    doc.add_paragraph("")
-    doc.add_paragraph("")
-    doc.add_paragraph("____________________________________")
-    doc.add_paragraph("Brad")
-    doc.add_paragraph("Vanguard Security Services")
-    doc.add_paragraph("")
-    doc.add_paragraph("cc: Rosenblum (Counsel)")
+        parts.append(P(f"RE: {row['entity_owner']}"))
+    parts += [
+        P(f"Property: {row['address']}"),
+        P(f"Tenant/Occupant: {row['business_name']}"),
+        P(),
+        DEMAND_BODY_XML.format(
+            sqft=f"{sqft:,}",
+            pct=f"{pct:.4%}",
+            weekly=money(curr_wkly),
+            fwd_monthly=money(fwd_monthly),
+            arrears=money(arrears),
+            arrears_owed=money(arrears) if arrears else "TO BE DETERMINED (pending reconciliation)",
+            cure_date=cure_date,
+        ),
+    ]
+    _append_body_xml(doc, "".join(parts))
 
     # Save
-    safe_name = row["business_name"].replace("/", "-").replace(" ", "_")
-    filename = f"Demand_{safe_name}_{datetime.now():%Y%m%d}.docx"
-    filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
-    doc.save(filepath)
+    safe_name = row["business_name"].translate(_SAFE_TRANS)
+    filename = f"Demand_{safe_name}_{_now:%Y%m%d}.docx"
+    filepath = os.path.join(BASE_DIR, filename)
+    _save_docx(doc, filepath)
 
     # Log the action
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    conn.execute(
-        """INSERT INTO enforcement_log
-           (parcel_id, timestamp, action, next_step, attorney, notes)
-           VALUES (?,?,?,?,?,?)""",
-        (pid, now, f"Demand letter generated: {filename}",
+    now = _now.strftime("%Y-%m-%d %H:%M:%S")
+    log_actions(conn, [
+        (pid, now, f"Demand letter generated: {filename}", None,
          "Send via certified mail", "Rosenblum", f"Arrears: {money(arrears)}"),
-    )
-    conn.commit()
+    ])
 
     print(f"\n  Demand letter saved: {filepath}")
     print(f"  Parcel:    {row['business_name']}")
@@ -882,7 +1026,7 @@ def settlement_calculator(conn):
     if pid:
         try:
             pid = int(pid)
-            row = conn.execute("SELECT * FROM parcels WHERE id = ?", (pid,)).fetchone()
+            row = conn.execute(SQL_GET_PARCEL, (pid,)).fetchone()
             if not row:
                 print(f"  No parcel with ID {pid}.")
                 pause()
@@ -952,102 +1096,144 @@ def settlement_calculator(conn):
 # MENU 7: EXPORT TO EXCEL
 # ═══════════════════════════════════════════════════════════════════════════════
 
+STATUS_FILL_COLORS = {
+    "CURRENT": "C6EFCE", "DELINQUENT": "FFC7CE", "DISPUTED": "FFEB9C",
+    "RECON": "BDD7EE", "VERIFY": "BDD7EE", "SETTLED": "C6EFCE",
+}
+FILL_COLOR_NAMES = {"C6EFCE": "Green", "FFC7CE": "Red", "FFEB9C": "Yellow", "BDD7EE": "Blue"}
+
+# Number formats by Parcel Master column (1-based); other columns are General
+PARCEL_NUMBER_FORMATS = {4: "0.00%", 6: "$#,##0.00", 7: "$#,##0.00", 8: "$#,##0.00", 9: "$#,##0.00"}
+
+
+@lru_cache(maxsize=1)
+def _xl_styles():
+    """Shared openpyxl style objects, built once on first export."""
+    from openpyxl.styles import Font, PatternFill, Border, Side
+    from openpyxl.styles.fonts import DEFAULT_FONT
+    thin = Side(style="thin")
+    solid = lambda c: PatternFill(start_color=c, end_color=c, fill_type="solid")
+    return {
+        "border": Border(left=thin, right=thin, top=thin, bottom=thin),
+        "font": DEFAULT_FONT,
+        "header_font": Font(bold=True, size=11, color="FFFFFF"),
+        "header_fill": solid("4472C4"),
+        "title_font": Font(bold=True, size=14),
+        "bold": Font(bold=True),
+        "fills": {hex_color: solid(hex_color) for hex_color in set(STATUS_FILL_COLORS.values())},
+    }
+
+
 def export_excel(conn):
     header("EXPORT TO EXCEL")
 
     try:
         from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, numbers
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import NamedStyle
     except ImportError:
         print("  Error: openpyxl is not installed.")
         print("  Run: pip install openpyxl")
         pause()
         return
 
-    wb = Workbook()
-    thin_border = Border(
-        left=Side(style="thin"), right=Side(style="thin"),
-        top=Side(style="thin"), bottom=Side(style="thin"),
-    )
-    header_font = Font(bold=True, size=11)
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font_white = Font(bold=True, size=11, color="FFFFFF")
-
-    # Status fills
-    fills = {
-        "CURRENT": PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
-        "DELINQUENT": PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
-        "DISPUTED": PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid"),
-        "RECON": PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid"),
-        "VERIFY": PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid"),
-        "SETTLED": PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
-    }
+    st = _xl_styles()
+    wb = Workbook(write_only=True)
+
+    # Each border/fill/number-format combination is registered once as a
+    # named style, so a cell takes one style name instead of separate
+    # font/fill/border/number_format assignments.
+    def named(name, **attrs):
+        attrs.setdefault("font", st["font"])
+        wb.add_named_style(NamedStyle(name=name, border=st["border"], **attrs))
+        return name
+
+    header_style = named("KG Header", font=st["header_font"], fill=st["header_fill"])
+    # Parcel Master: per status fill colour (None = unfilled), a style per column
+    parcel_styles = {}
+    for hex_color, color_name in (*FILL_COLOR_NAMES.items(), (None, "Plain")):
+        fill = {"fill": st["fills"][hex_color]} if hex_color else {}
+        by_format = {
+            fmt: named(f"KG {color_name} {label}", number_format=fmt, **fill)
+            for fmt, label in (("General", "Text"), ("0.00%", "Pct"), ("$#,##0.00", "Money"))
+        }
+        parcel_styles[hex_color] = [
+            by_format[PARCEL_NUMBER_FORMATS.get(ci, "General")] for ci in range(1, 16)
+        ]
+    plain_style, money_style = "KG Plain Text", "KG Plain Money"
+
+    def set_widths(ws, widths):
+        for i, w in enumerate(widths):
+            ws.column_dimensions[chr(65 + i)].width = w
+
+    def styled_row(ws, values, styles, skip_empty=False):
+        row = []
+        for v, style in zip(values, styles):
+            if v is None and skip_empty:
+                row.append(None)  # left blank and unstyled; nothing is written
+                continue
+            c = WriteOnlyCell(ws, value=v)
+            c.style = style
+            row.append(c)
+        ws.append(row)
+
+    def cell(ws, value, font=None, fill=None):
+        c = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            c.font = font
+        if fill is not None:
+            c.fill = fill
+        return c
 
     # ── Sheet 1: Parcel Master ──
-    ws1 = wb.active
-    ws1.title = "Parcel Master"
+    # Write-only sheets emit <cols> with the first row, so widths go first.
+    ws1 = wb.create_sheet("Parcel Master")
+    set_widths(ws1, [24, 30, 8, 10, 14, 16, 18, 16, 14, 30, 32, 18, 28, 12, 40])
     headers1 = [
         "Address", "Business Name", "SqFt", "% of Campus", "Status",
         "Historic Wkly Share", "36-Mo Arrears (156 wks)", "Current Wkly Share",
         "Fwd Monthly", "Entity/Owner", "Corporate Target", "Enforcement Step",
         "Next Action", "Deadline", "Notes"
     ]
-    for col, h in enumerate(headers1, 1):
-        cell = ws1.cell(row=1, column=col, value=h)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.border = thin_border
-
-    rows = conn.execute("SELECT * FROM parcels ORDER BY id").fetchall()
-    for ri, r in enumerate(rows, 2):
-        sqft = r["sqft"] or 0
-        arrears = get_arrears(r)
-        curr_wkly = get_weekly(r)
-        fwd_mo = get_forward_monthly(r)
-        hist_wkly = calc_historic_weekly(sqft)
-
+    styled_row(ws1, headers1, [header_style] * len(headers1))
+
+    rows = fetch_tuples(
+        conn,
+        """SELECT address, business_name, COALESCE(sqft, 0), pct_campus, status,
+                  past_due_balance, weekly_rate, entity_owner, corporate_target,
+                  enforcement_step, next_action, deadline, notes
+           FROM parcels ORDER BY id""",
+    ).fetchall()
+    for (address, business_name, sqft, pct_campus, status, past_due, weekly_rate,
+         *tail) in rows:
+        weekly = _weekly(weekly_rate, sqft)
         vals = [
-            r["address"], r["business_name"], sqft, r["pct_campus"],
-            r["status"], hist_wkly, arrears, curr_wkly, fwd_mo,
-            r["entity_owner"], r["corporate_target"], r["enforcement_step"],
-            r["next_action"], r["deadline"], r["notes"]
+            address, business_name, sqft, pct_campus, status,
+            calc_historic_weekly(sqft), _arrears(past_due, status, sqft),
+            weekly, weekly * 4.333, *tail,
         ]
-        for ci, v in enumerate(vals, 1):
-            cell = ws1.cell(row=ri, column=ci, value=v)
-            cell.border = thin_border
-            if r["status"] in fills:
-                cell.fill = fills[r["status"]]
-
-        # Format numbers
-        ws1.cell(row=ri, column=4).number_format = '0.00%'
-        for col_idx in (6, 7, 8, 9):
-            ws1.cell(row=ri, column=col_idx).number_format = '$#,##0.00'
-
-    # Autofit-ish widths
-    widths = [24, 30, 8, 10, 14, 16, 18, 16, 14, 30, 32, 18, 28, 12, 40]
-    for i, w in enumerate(widths, 1):
-        ws1.column_dimensions[ws1.cell(row=1, column=i).column_letter].width = w
+        styled_row(ws1, vals, parcel_styles[STATUS_FILL_COLORS.get(status)], skip_empty=True)
 
     # ── Sheet 2: Enforcement Timeline ──
     ws2 = wb.create_sheet("Enforcement Timeline")
+    set_widths(ws2, [20, 24, 28, 40, 16, 14, 14, 30, 14, 10, 40])
     headers2 = [
         "Date", "Parcel Address", "Business Name", "Action Taken",
         "Sent Via", "Response Due", "Response Received", "Next Step",
         "Attorney", "Cost", "Notes"
     ]
-    for col, h in enumerate(headers2, 1):
-        cell = ws2.cell(row=1, column=col, value=h)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.border = thin_border
+    styled_row(ws2, headers2, [header_style] * len(headers2))
 
-    log_rows = conn.execute(
+    # Streamed straight from the cursor into the write-only sheet
+    log_cur = conn.execute(
         """SELECT el.*, p.address, p.business_name
            FROM enforcement_log el
            LEFT JOIN parcels p ON el.parcel_id = p.id
-           ORDER BY el.timestamp DESC"""
-    ).fetchall()
-    for ri, r in enumerate(log_rows, 2):
+           ORDER BY el.timestamp DESC, el.id DESC"""
+    )
+    log_styles = [plain_style] * 9 + [money_style, plain_style]
+    n_log = 0
+    for n_log, r in enumerate(log_cur, 1):
         vals = [
             r["timestamp"],
             r["address"] or "ALL PARCELS",
@@ -1056,89 +1242,78 @@ def export_excel(conn):
             r["response_received"], r["next_step"],
             r["attorney"], r["cost"], r["notes"]
         ]
-        for ci, v in enumerate(vals, 1):
-            cell = ws2.cell(row=ri, column=ci, value=v)
-            cell.border = thin_border
-        ws2.cell(row=ri, column=10).number_format = '$#,##0.00'
-
-    widths2 = [20, 24, 28, 40, 16, 14, 14, 30, 14, 10, 40]
-    for i, w in enumerate(widths2, 1):
-        ws2.column_dimensions[ws2.cell(row=1, column=i).column_letter].width = w
+        styled_row(ws2, vals, log_styles)
 
     # ── Sheet 3: Settlement Calculator ──
     ws3 = wb.create_sheet("Settlement Calculator")
-    ws3.cell(row=1, column=1, value="KIRBY GATE - SETTLEMENT CALCULATOR").font = Font(bold=True, size=14)
-    labels = [
-        (3, "INPUT PARAMETERS:"),
-        (4, "Parcel Address"), (5, "Total Arrears Owed"), (6, "Discount Offered (%)"),
-        (7, "Interest Rate (%)"), (8, "Payment Term (months)"),
-        (10, "CALCULATED OUTPUTS:"),
-        (11, "Settled Amount"), (12, "Monthly Payment (no interest)"),
-        (13, "Total w/ Interest"), (14, "Monthly Payment (w/ interest)"),
-        (15, "Savings vs Full Arrears"), (16, "Savings %"),
-        (17, "Savings vs Litigation Est."),
-        (19, "Note: Litigation est. assumes 40% premium (legal fees + time)"),
-    ]
-    for row_num, label in labels:
-        ws3.cell(row=row_num, column=1, value=label)
-    # Default values
-    ws3.cell(row=5, column=2, value=50000)
-    ws3.cell(row=6, column=2, value=0.35)
-    ws3.cell(row=7, column=2, value=0.02)
-    ws3.cell(row=8, column=2, value=36)
-    ws3.column_dimensions["A"].width = 30
-    ws3.column_dimensions["B"].width = 18
+    set_widths(ws3, [30, 18])
+    defaults = {5: 50000, 6: 0.35, 7: 0.02, 8: 36}
+    labels = {
+        3: "INPUT PARAMETERS:",
+        4: "Parcel Address", 5: "Total Arrears Owed", 6: "Discount Offered (%)",
+        7: "Interest Rate (%)", 8: "Payment Term (months)",
+        10: "CALCULATED OUTPUTS:",
+        11: "Settled Amount", 12: "Monthly Payment (no interest)",
+        13: "Total w/ Interest", 14: "Monthly Payment (w/ interest)",
+        15: "Savings vs Full Arrears", 16: "Savings %",
+        17: "Savings vs Litigation Est.",
+        19: "Note: Litigation est. assumes 40% premium (legal fees + time)",
+    }
+    ws3.append([cell(ws3, "KIRBY GATE - SETTLEMENT CALCULATOR", font=st["title_font"])])
+    for row_num in range(2, 20):
+        if row_num not in labels:
+            ws3.append([])
+        elif row_num in defaults:
+            ws3.append([labels[row_num], defaults[row_num]])
+        else:
+            ws3.append([labels[row_num]])
 
     # ── Sheet 4: Rates & Constants ──
     ws4 = wb.create_sheet("Rates & Constants")
-    ws4.cell(row=1, column=1, value="KIRBY GATE - KEY RATES & CONSTANTS").font = Font(bold=True, size=14)
+    set_widths(ws4, [30, 18, 40])
+    ws4.append([cell(ws4, "KIRBY GATE - KEY RATES & CONSTANTS", font=st["title_font"])])
+    ws4.append([])
     constants = [
-        (3, "Total Campus SqFt", TOTAL_CAMPUS_SQFT, "21 parcels total"),
-        (4, "Historic Weekly Rate (campus)", HISTORIC_WEEKLY_RATE, "Pre-Jan 2026 rate"),
-        (5, "Current Weekly Rate (campus)", CURRENT_WEEKLY_RATE, "Jan 2026+ rate"),
-        (6, "Arrears Period (weeks)", ARREARS_WEEKS, "36 months x 4.333"),
-        (7, "Arrears Period (months)", 36, "3-year lookback"),
-        (8, "Statute of Limitations (years)", 6, "Tennessee contract SOL"),
-        (9, "Max SOL Period (months)", 72, "Full 6-year lookback possible"),
-        (10, "Lien Default Trigger (days)", CURE_PERIOD_DAYS, "Declaration cure period"),
-        (11, "Lien Filing Deadline", LIEN_DEADLINE, "HARD DEADLINE"),
-        (12, "Declaration Recorded", DECLARATION_DATE, "Instrument # needed from Rosenblum"),
-        (13, "Paying Parcels", 9, "Current / compliant"),
-        (14, "Non-Paying Parcels", 7, "Delinquent - demand needed"),
-        (15, "Disputed Parcels", 1, "GALR - attorney involved"),
-        (16, "Recon Needed", 2, "KG Business + Car Wash"),
-        (17, "Attorney", "Rosenblum", "Lead counsel - enforcement"),
-        (18, "Wills Designation", "Shannon Wills", "Original spreadsheet / data source"),
+        ("Total Campus SqFt", TOTAL_CAMPUS_SQFT, "21 parcels total"),
+        ("Historic Weekly Rate (campus)", HISTORIC_WEEKLY_RATE, "Pre-Jan 2026 rate"),
+        ("Current Weekly Rate (campus)", CURRENT_WEEKLY_RATE, "Jan 2026+ rate"),
+        ("Arrears Period (weeks)", ARREARS_WEEKS, "36 months x 4.333"),
+        ("Arrears Period (months)", 36, "3-year lookback"),
+        ("Statute of Limitations (years)", 6, "Tennessee contract SOL"),
+        ("Max SOL Period (months)", 72, "Full 6-year lookback possible"),
+        ("Lien Default Trigger (days)", CURE_PERIOD_DAYS, "Declaration cure period"),
+        ("Lien Filing Deadline", LIEN_DEADLINE, "HARD DEADLINE"),
+        ("Declaration Recorded", DECLARATION_DATE, "Instrument # needed from Rosenblum"),
+        ("Paying Parcels", 9, "Current / compliant"),
+        ("Non-Paying Parcels", 7, "Delinquent - demand needed"),
+        ("Disputed Parcels", 1, "GALR - attorney involved"),
+        ("Recon Needed", 2, "KG Business + Car Wash"),
+        ("Attorney", "Rosenblum", "Lead counsel - enforcement"),
+        ("Wills Designation", "Shannon Wills", "Original spreadsheet / data source"),
     ]
-    for row_num, label, val, note in constants:
-        ws4.cell(row=row_num, column=1, value=label)
-        ws4.cell(row=row_num, column=2, value=val)
-        ws4.cell(row=row_num, column=3, value=note)
+    for label, val, note in constants:
+        ws4.append([label, val, note])
 
-    ws4.cell(row=21, column=1, value="COLOR LEGEND:").font = Font(bold=True)
+    ws4.append([])
+    ws4.append([])
+    ws4.append([cell(ws4, "COLOR LEGEND:", font=st["bold"])])
     legend = [
-        (22, "Green", "Current / Paying", "C6EFCE"),
-        (23, "Red", "Delinquent - Demand Required", "FFC7CE"),
-        (24, "Yellow", "Disputed - Attorney Involved", "FFEB9C"),
-        (25, "Blue", "Recon Needed / Verify", "BDD7EE"),
+        ("Green", "Current / Paying", "C6EFCE"),
+        ("Red", "Delinquent - Demand Required", "FFC7CE"),
+        ("Yellow", "Disputed - Attorney Involved", "FFEB9C"),
+        ("Blue", "Recon Needed / Verify", "BDD7EE"),
     ]
-    for row_num, color, desc, hex_color in legend:
-        c1 = ws4.cell(row=row_num, column=1, value=color)
-        c1.fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
-        ws4.cell(row=row_num, column=2, value=desc)
-
-    ws4.column_dimensions["A"].width = 30
-    ws4.column_dimensions["B"].width = 18
-    ws4.column_dimensions["C"].width = 40
+    for color, desc, hex_color in legend:
+        ws4.append([cell(ws4, color, fill=st["fills"][hex_color]), desc])
 
     # Save
     filename = f"KirbyGate_Export_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
-    filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    filepath = os.path.join(BASE_DIR, filename)
     wb.save(filepath)
 
     print(f"  Exported to: {filepath}")
     print(f"  Sheets: Parcel Master, Enforcement Timeline, Settlement Calculator, Rates & Constants")
-    print(f"  Parcels: {len(rows)} | Log entries: {len(log_rows)}")
+    print(f"  Parcels: {len(rows)} | Log entries: {n_log}")
     pause()
 
 
@@ -1146,34 +1321,41 @@ def export_excel(conn):
 # MENU 8: ENFORCEMENT TIMELINE
 # ═══════════════════════════════════════════════════════════════════════════════
 
+TIMELINE_ROW_FMT = "  {:<20} {:<26} {:<40} {:<16} {:<12}".format
+TIMELINE_NEXT_FMT = f"  {'':20} {'':26} -> Next: {{}}".format
+
 def view_timeline(conn):
     header("ENFORCEMENT TIMELINE")
-    rows = conn.execute(
-        """SELECT el.*, p.address, p.business_name
+    # Stream the log from the cursor; only the first row is fetched up front
+    cur = fetch_tuples(
+        conn,
+        """SELECT el.timestamp, p.address, el.action, el.sent_via,
+                  el.response_due, el.next_step
            FROM enforcement_log el
            LEFT JOIN parcels p ON el.parcel_id = p.id
-           ORDER BY el.timestamp DESC"""
-    ).fetchall()
+           ORDER BY el.timestamp DESC, el.id DESC""",
+    )
+    first = cur.fetchone()
 
-    if not rows:
+    if first is None:
         print("  No enforcement actions logged yet.")
         pause()
         return
 
     print(f"  {'Date':<20} {'Parcel':<26} {'Action':<40} {'Via':<16} {'Due':<12}")
     print("  " + "-" * 120)
-    for r in rows:
-        parcel = r["address"] or "ALL PARCELS"
-        print(
-            f"  {trunc(r['timestamp'], 20):<20} {trunc(parcel, 26):<26} "
-            f"{trunc(r['action'], 40):<40} {trunc(r['sent_via'], 16):<16} "
-            f"{trunc(r['response_due'], 12):<12}"
-        )
-        if r["next_step"]:
-            print(f"  {'':20} {'':26} -> Next: {r['next_step']}")
+    _trunc = trunc
+    row_fmt = TIMELINE_ROW_FMT
+    next_fmt = TIMELINE_NEXT_FMT
+    for n_actions, (timestamp, address, action, sent_via, response_due, next_step) in enumerate(
+            chain((first,), cur), 1):
+        print(row_fmt(_trunc(timestamp, 20), _trunc(address or "ALL PARCELS", 26),
+                      _trunc(action, 40), _trunc(sent_via, 16), _trunc(response_due, 12)))
+        if next_step:
+            print(next_fmt(next_step))
 
     print()
-    print(f"  Total actions logged: {len(rows)}")
+    print(f"  Total actions logged: {n_actions}")
 
     # Upcoming deadlines
     print()
@@ -1183,8 +1365,11 @@ def view_timeline(conn):
            FROM parcels WHERE deadline IS NOT NULL AND deadline != ''
            ORDER BY deadline"""
     ).fetchall()
+    # deadline is free text from update_parcel, so keep strptime here; the
+    # fixed-offset parse_iso is only for isoformat() columns
+    now = datetime.now()
     for d in deadlines:
-        days = (datetime.strptime(d["deadline"], "%Y-%m-%d") - datetime.now()).days
+        days = (datetime.strptime(d["deadline"], "%Y-%m-%d") - now).days
         flag = " ** OVERDUE **" if days < 0 else f" ({days} days)"
         print(f"    {d['deadline']}  {d['address']:<24} {d['next_action'] or '—'}{flag}")
 
@@ -1199,26 +1384,29 @@ def view_timeline(conn):
 def dashboard(conn):
     header("DASHBOARD SUMMARY")
 
-    all_rows = conn.execute("SELECT * FROM parcels").fetchall()
-    current = [r for r in all_rows if r["status"] == "CURRENT"]
-    delinquent = [r for r in all_rows if r["status"] == "DELINQUENT"]
-    disputed = [r for r in all_rows if r["status"] == "DISPUTED"]
-    recon = [r for r in all_rows if r["status"] in ("RECON", "VERIFY")]
-    settled = [r for r in all_rows if r["status"] == "SETTLED"]
-
-    total_campus_sqft = sum(r["sqft"] or 0 for r in all_rows)
-    delinq_arrears = sum(get_arrears(r) for r in delinquent)
-    disputed_arrears = sum(get_arrears(r) for r in disputed)
-    recon_arrears = sum(get_arrears(r) for r in recon)
+    # Counts and sums per status bucket (VERIFY reports with RECON)
+    stats = {
+        bucket: (n, arrears, weekly)
+        for bucket, n, arrears, weekly in fetch_tuples(conn, DASHBOARD_BUCKETS_SQL)
+    }
+    empty = (0, 0, 0)
+    n_current, _, _ = stats.get("CURRENT", empty)
+    n_delinquent, delinq_arrears, delinq_weekly = stats.get("DELINQUENT", empty)
+    n_disputed, disputed_arrears, _ = stats.get("DISPUTED", empty)
+    n_recon, recon_arrears, _ = stats.get("RECON", empty)
+    n_settled, _, _ = stats.get("SETTLED", empty)
+
+    totals = parcel_totals(conn)
+    n_parcels = sum(n for n, _, _ in stats.values())
+    total_campus_sqft = totals["total_sqft"]
     total_arrears = delinq_arrears + disputed_arrears + recon_arrears
-    delinq_weekly = sum(get_weekly(r) for r in delinquent)
-    total_weekly = sum(get_weekly(r) for r in all_rows)
+    total_weekly = totals["total_weekly"]
 
-    days_to_lien = (datetime.strptime(LIEN_DEADLINE, "%Y-%m-%d") - datetime.now()).days
+    days_to_lien = (LIEN_DEADLINE_DT - datetime.now()).days
 
-    print(f"  PARCELS:  {len(all_rows)} total  |  {len(current)} current  |  "
-          f"{len(delinquent)} delinquent  |  {len(disputed)} disputed  |  "
-          f"{len(recon)} recon/verify  |  {len(settled)} settled")
+    print(f"  PARCELS:  {n_parcels} total  |  {n_current} current  |  "
+          f"{n_delinquent} delinquent  |  {n_disputed} disputed  |  "
+          f"{n_recon} recon/verify  |  {n_settled} settled")
     print()
     print(f"  CAMPUS:   {total_campus_sqft:,} SF tracked of {TOTAL_CAMPUS_SQFT:,} SF total")
     print()
@@ -1240,14 +1428,13 @@ def dashboard(conn):
     print("  PRIORITY RANKING (by arrears amount):")
     print(f"  {'#':>3} {'Business':<30} {'Arrears':>14} {'Status':<12}")
     print("  " + "-" * 64)
-    ranked = sorted(
-        [r for r in all_rows if r["status"] != "CURRENT"],
-        key=lambda r: get_arrears(r),
-        reverse=True,
+    ranked = fetch_tuples(
+        conn,
+        """SELECT business_name, eff_arrears, status FROM v_parcels_econ
+           WHERE status IS NOT 'CURRENT' ORDER BY eff_arrears DESC, id"""
     )
-    for i, r in enumerate(ranked, 1):
-        arr = get_arrears(r)
-        print(f"  {i:>3} {trunc(r['business_name'], 30):<30} {money(arr):>14} {r['status']:<12}")
+    for i, (business_name, arr, status) in enumerate(ranked, 1):
+        print(f"  {i:>3} {trunc(business_name, 30):<30} {money(arr):>14} {status:<12}")
 
     # Log count
     log_count = conn.execute("SELECT COUNT(*) as c FROM enforcement_log").fetchone()["c"]
@@ -1265,8 +1452,10 @@ def prorata_calculator(conn):
     print(f"  Declaration Formula:  (Parcel SF / {TOTAL_CAMPUS_SQFT:,} SF) x ${CURRENT_WEEKLY_RATE:,.2f}/week")
     print()
 
-    rows = conn.execute(
-        "SELECT * FROM parcels WHERE status = 'DELINQUENT' ORDER BY sqft DESC"
+    rows = fetch_tuples(
+        conn,
+        """SELECT id, business_name, address, COALESCE(sqft, 0), COALESCE(weekly_rate, 0)
+           FROM parcels WHERE status = 'DELINQUENT' ORDER BY sqft DESC""",
     ).fetchall()
 
     if not rows:
@@ -1280,31 +1469,27 @@ def prorata_calculator(conn):
           f"{'Diff/Wk':>10} {'Pro-Rata Mo':>12} {'Billed Mo':>11}")
     print("  " + "-" * 155)
 
-    total_prorata_wk = 0
-    total_billed_wk = 0
-    total_prorata_mo = 0
-    total_billed_mo = 0
+    # Derived columns, computed column-wise once; the table loop only formats.
+    ids, names, addresses, sqfts, billed_wks = zip(*rows)
+    pcts = [sqft / TOTAL_CAMPUS_SQFT for sqft in sqfts]
+    prorata_wks = [CURRENT_WEEKLY_RATE * pct for pct in pcts]
+    prorata_mos = [wk * 4.333 for wk in prorata_wks]
+    billed_mos = [wk * 4.333 for wk in billed_wks]
 
-    for r in rows:
-        sqft = r["sqft"] or 0
-        pct = sqft / TOTAL_CAMPUS_SQFT
-        prorata_wk = CURRENT_WEEKLY_RATE * pct
-        billed_wk = r["weekly_rate"] or 0
-        diff_wk = prorata_wk - billed_wk
-        prorata_mo = prorata_wk * 4.333
-        billed_mo = billed_wk * 4.333
-
-        total_prorata_wk += prorata_wk
-        total_billed_wk += billed_wk
-        total_prorata_mo += prorata_mo
-        total_billed_mo += billed_mo
+    total_prorata_wk = sum(prorata_wks)
+    total_billed_wk = sum(billed_wks)
+    total_prorata_mo = sum(prorata_mos)
+    total_billed_mo = sum(billed_mos)
 
+    for pid, name, address, sqft, pct, prorata_wk, billed_wk, prorata_mo, billed_mo in zip(
+            ids, names, addresses, sqfts, pcts, prorata_wks, billed_wks, prorata_mos, billed_mos):
+        diff_wk = prorata_wk - billed_wk
         diff_flag = ""
         if abs(diff_wk) > 1:
             diff_flag = " ^" if diff_wk > 0 else " v"
 
-        print(f"  {r['id']:>3}  {trunc(r['business_name'], 30):<30} "
-              f"{trunc(r['address'], 22):<22} "
+        print(f"  {pid:>3}  {trunc(name, 30):<30} "
+              f"{trunc(address, 22):<22} "
               f"{sqft:>8,} {pct:>8.4%} {money(prorata_wk):>12} "
               f"{money(billed_wk):>11} {money(diff_wk):>10}{diff_flag} "
               f"{money(prorata_mo):>12} {money(billed_mo):>11}")
@@ -1335,7 +1520,7 @@ def prorata_calculator(conn):
             pause()
             return
 
-        row = conn.execute("SELECT * FROM parcels WHERE id = ?", (pid,)).fetchone()
+        row = conn.execute(SQL_GET_PARCEL, (pid,)).fetchone()
         if not row:
             print(f"  No parcel with ID {pid}.")
             pause()
@@ -1408,7 +1593,7 @@ def mark_packet_sent(conn):
         pause()
         return
 
-    row = conn.execute("SELECT * FROM parcels WHERE id = ?", (pid,)).fetchone()
+    row = conn.execute(SQL_GET_PARCEL, (pid,)).fetchone()
     if not row:
         print(f"  No parcel with ID {pid}.")
         pause()
@@ -1454,11 +1639,19 @@ YELLOW = "\033[93m"
 RESET = "\033[0m"
 BOLD = "\033[1m"
 
+# Deadline row templates, one per urgency band; colors are baked in once
+_DEADLINE_COLS = "{:<12} {:>5}d {:<18} {:<28} {:<24} {:<24}"
+OVERDUE_FMT = f"  {RED}{_DEADLINE_COLS}{RESET}{RED}{BOLD} ** OVERDUE **{RESET}"
+URGENT_FMT = f"  {RED}{_DEADLINE_COLS}{RESET}{RED}{BOLD} ** URGENT **{RESET}"
+SOON_FMT = f"  {YELLOW}{_DEADLINE_COLS}{RESET}{YELLOW} * SOON *{RESET}"
+LATER_FMT = f"  {_DEADLINE_COLS}{RESET}"
+
 
 def view_deadlines(conn):
     header("UPCOMING DEADLINES")
 
     today = datetime.now().date()
+    today_ord = today.toordinal()
 
     # Gather all deadline entries from parcels with packet sent dates
     rows = conn.execute(
@@ -1485,8 +1678,7 @@ def view_deadlines(conn):
             ("attorney_referral_date", "60-Day ATTORNEY"),
         ]:
             if r[date_col]:
-                dl_date = datetime.strptime(r[date_col], "%Y-%m-%d").date()
-                days_left = (dl_date - today).days
+                days_left = parse_iso(r[date_col]) - today_ord
                 deadlines.append({
                     "date": r[date_col],
                     "days_left": days_left,
@@ -1505,30 +1697,26 @@ def view_deadlines(conn):
           f"{'Address':<24} {'Tracking #':<24}")
     print("  " + "-" * 115)
 
+    _trunc = trunc
+    out = []
+    append = out.append
     for d in deadlines:
         days = d["days_left"]
 
         # Color coding
         if days < 0:
-            flag = f"{RED}{BOLD} ** OVERDUE **{RESET}"
-            prefix = RED
+            fmt = OVERDUE_FMT
         elif days <= 7:
-            flag = f"{RED}{BOLD} ** URGENT **{RESET}"
-            prefix = RED
+            fmt = URGENT_FMT
         elif days <= 14:
-            flag = f"{YELLOW} * SOON *{RESET}"
-            prefix = YELLOW
+            fmt = SOON_FMT
         else:
-            flag = ""
-            prefix = ""
-
-        line = (
-            f"  {prefix}{d['date']:<12} {days:>5}d {d['type']:<18} "
-            f"{trunc(d['business'], 28):<28} "
-            f"{trunc(d['address'], 24):<24} "
-            f"{trunc(d['tracking'], 24):<24}{RESET}{flag}"
-        )
-        print(line)
+            fmt = LATER_FMT
+
+        append(fmt.format(d["date"], days, d["type"], _trunc(d["business"], 28),
+                          _trunc(d["address"], 24), _trunc(d["tracking"], 24)))
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
 
     print("  " + "-" * 115)
     print()
@@ -1550,7 +1738,7 @@ def view_deadlines(conn):
 
     print()
     # Show the hard lien deadline
-    lien_days = (datetime.strptime(LIEN_DEADLINE, "%Y-%m-%d").date() - today).days
+    lien_days = (LIEN_DEADLINE_DATE - today).days
     print(f"  {BOLD}HARD DEADLINE:  {LIEN_DEADLINE}  —  File liens on all non-responders  ({lien_days} days){RESET}")
 
     # Per-parcel summary
@@ -1558,13 +1746,13 @@ def view_deadlines(conn):
     print(f"  PACKETS SENT: {len(rows)} parcels")
     print(f"  {'ID':>3}  {'Business':<28} {'Sent':<12} {'Cure':<12} {'Lien':<12} {'Attorney':<12} {'Tracking #':<24}")
     print("  " + "-" * 108)
-    for r in rows:
-        print(f"  {r['id']:>3}  {trunc(r['business_name'], 28):<28} "
-              f"{r['date_packet_sent'] or '—':<12} "
-              f"{r['cure_deadline'] or '—':<12} "
-              f"{r['lien_filing_date'] or '—':<12} "
-              f"{r['attorney_referral_date'] or '—':<12} "
-              f"{trunc(r['certified_mail_tracking'], 24):<24}")
+    summary_fmt = "  {:>3}  {:<28} {:<12} {:<12} {:<12} {:<12} {:<24}\n".format
+    sys.stdout.write("".join([
+        summary_fmt(r["id"], _trunc(r["business_name"], 28), r["date_packet_sent"] or "—",
+                    r["cure_deadline"] or "—", r["lien_filing_date"] or "—",
+                    r["attorney_referral_date"] or "—", _trunc(r["certified_mail_tracking"], 24))
+        for r in rows
+    ]))
 
     pause()
 
@@ -1573,6 +1761,8 @@ def view_deadlines(conn):
 # MENU 13: LENDER / TITLE RESEARCH TRACKER
 # ═══════════════════════════════════════════════════════════════════════════════
 
+LENDER_SUMMARY_FMT = "  {:>3} {:<28} {:>4} {:>4} {:<16} {:<30} {:<16}\n".format
+
 def lender_research_tracker(conn):
     header("LENDER / TITLE RESEARCH TRACKER")
 
@@ -1600,22 +1790,16 @@ def lender_research_tracker(conn):
           f"{'County Parcel':<16} {'Lender':<30} {'DoT Ref':<16}")
     print("  " + "-" * 105)
 
-    verified_addr = 0
-    verified_lender = 0
-    for r in rows:
-        av = "YES" if r["address_verified"] else "---"
-        lv = "YES" if r["lender_verified"] else "---"
-        if r["address_verified"]:
-            verified_addr += 1
-        if r["lender_verified"]:
-            verified_lender += 1
-
-        cpid = r["county_parcel_id"] or "—"
-        lname = r["lender_name"] or "—"
-        dot = r["deed_of_trust_ref"] or "—"
-
-        print(f"  {r['id']:>3} {r['business_name']:<28} {av:>4} {lv:>4} "
-              f"{cpid:<16} {lname:<30} {dot:<16}")
+    sys.stdout.write("".join([
+        LENDER_SUMMARY_FMT(r["id"], r["business_name"],
+                           "YES" if r["address_verified"] else "---",
+                           "YES" if r["lender_verified"] else "---",
+                           r["county_parcel_id"] or "—", r["lender_name"] or "—",
+                           r["deed_of_trust_ref"] or "—")
+        for r in rows
+    ]))
+    verified_addr = sum(1 for r in rows if r["address_verified"])
+    verified_lender = sum(1 for r in rows if r["lender_verified"])
 
     print("  " + "-" * 105)
     print(f"  Address verified: {verified_addr}/{len(rows)}  |  "
@@ -1641,7 +1825,7 @@ def lender_research_tracker(conn):
             print("  Invalid ID.")
             pause()
             return
-        row = conn.execute("SELECT * FROM parcels WHERE id = ?", (pid,)).fetchone()
+        row = conn.execute(SQL_GET_PARCEL, (pid,)).fetchone()
         if not row:
             print(f"  No parcel with ID {pid}.")
             pause()
@@ -1676,7 +1860,7 @@ def lender_research_tracker(conn):
             print("  Invalid ID.")
             pause()
             return
-        row = conn.execute("SELECT * FROM parcels WHERE id = ?", (pid,)).fetchone()
+        row = conn.execute(SQL_GET_PARCEL, (pid,)).fetchone()
         if not row:
             print(f"  No parcel with ID {pid}.")
             pause()
@@ -1711,7 +1895,7 @@ def lender_research_tracker(conn):
             values = list(updates.values()) + [pid]
             conn.execute(f"UPDATE parcels SET {set_clause} WHERE id = ?", values)
 
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            now = _ts(datetime.now())
             fields_updated = ", ".join(updates.keys())
             conn.execute(
                 """INSERT INTO enforcement_log (parcel_id, timestamp, action, notes)
@@ -1735,7 +1919,7 @@ def lender_research_tracker(conn):
             pause()
             return
         conn.execute("UPDATE parcels SET address_verified = 1 WHERE id = ?", (pid,))
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = _ts(datetime.now())
         conn.execute(
             """INSERT INTO enforcement_log (parcel_id, timestamp, action, notes)
                VALUES (?, ?, ?, ?)""",
@@ -1754,7 +1938,7 @@ def lender_research_tracker(conn):
             pause()
             return
         conn.execute("UPDATE parcels SET lender_verified = 1 WHERE id = ?", (pid,))
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = _ts(datetime.now())
         conn.execute(
             """INSERT INTO enforcement_log (parcel_id, timestamp, action, notes)
                VALUES (?, ?, ?, ?)""",
@@ -1769,22 +1953,71 @@ def lender_research_tracker(conn):
 # MENU 14: GENERATE LENDER NOTIFICATION LETTER
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Lender notice body from the salutation to the cc line, rendered to XML once
+# at import; each letter only fills the {placeholders} with str.format.
+LENDER_BODY_XML = "".join([
+    _w_p("Dear Sir or Madam:"),
+    _w_p(),
+    _w_p("This letter serves as formal notice to you, as the secured lender of record "
+         "for the above-referenced property, that the property is in material default of the "
+         f"Declaration of Restrictive Covenants recorded on {DECLARATION_DATE} "
+         "(the \"Declaration\") governing the Kirby Gate commercial development, Memphis, Tennessee."),
+    _w_p(),
+    _w_p("Security One has been designated as the authorized security services provider under "
+         "the Declaration. Pursuant to the Declaration, each parcel owner is obligated to fund "
+         "its pro-rata share of campus-wide security services."),
+    _w_p(),
+    _w_p("DEFAULT AMOUNT:", bold=True),
+    _w_p(f"  Parcel Square Footage:    {{sqft}} SF of {TOTAL_CAMPUS_SQFT:,} SF campus"),
+    _w_p("  Pro-Rata Share:           {pct}"),
+    _w_p("  36-Month Arrears Owed:    {arrears}"),
+    _w_p(),
+    _w_p("NOTICE OF IMMINENT LIEN:", bold=True),
+    _w_p("Please be advised that unless the above arrears are cured in full, Security One "
+         "intends to record a Notice of Lien against this property under the Declaration "
+         f"on or before {LIEN_DEADLINE}."),
+    _w_p(),
+    _w_p("This lien, arising under a recorded Declaration of Restrictive Covenants, will "
+         "constitute an encumbrance on the property and may affect the priority, marketability, "
+         "and insurability of title. We are providing this notice to allow you, as a secured "
+         "creditor, to take whatever action you deem appropriate to protect your interest, "
+         "including but not limited to:"),
+    _w_p("  1. Contacting the borrower/owner to demand cure of the covenant default"),
+    _w_p("  2. Exercising any rights under your loan documents relating to covenant compliance"),
+    _w_p("  3. Ensuring that your title insurance covers the covenant lien"),
+    _w_p(),
+    _w_p("The Declaration provides for lien rights, fee-shifting, and enforcement in "
+         "Shelby County, Tennessee. The applicable statute of limitations for contract "
+         "enforcement is six (6) years under Tennessee law."),
+    _w_p(),
+    _w_p("We are available to discuss resolution of this matter and will provide "
+         "updates on the status of enforcement proceedings upon request."),
+    _w_p(),
+    _w_p("Respectfully,"),
+    _w_p(), _w_p(),
+    _w_p("____________________________________"),
+    _w_p("Brad"),
+    _w_p("Security One"),
+    _w_p(),
+    _w_p("cc: Jeff Rosenblum, Esq. (Counsel)"),
+])
+
 def generate_lender_notification(conn):
     header("GENERATE LENDER NOTIFICATION LETTER")
 
-    try:
-        from docx import Document
-        from docx.shared import Pt
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-    except ImportError:
+    docx = _docx()
+    if docx is None:
         print("  Error: python-docx is not installed.")
         print("  Run: pip install python-docx")
         pause()
         return
+    Document, Pt = docx[:2]
 
     # Show parcels with lender data
     rows = conn.execute(
-        """SELECT id, business_name, address, lender_name, lender_address, lender_verified
+        """SELECT id, business_name, address, lender_name, lender_address, lender_verified,
+                  lender_contact, loan_number, entity_owner, county_parcel_id,
+                  deed_of_trust_ref, sqft, status, past_due_balance
            FROM parcels
            WHERE status = 'DELINQUENT' AND lender_name IS NOT NULL AND lender_name != ''
            ORDER BY sqft DESC"""
@@ -1815,164 +2048,115 @@ def generate_lender_notification(conn):
             print("  Invalid ID.")
             pause()
             return
-        targets = [r for r in rows if r["id"] == pid]
+        rows_by_id = {r["id"]: r for r in rows}
+        targets = [rows_by_id[pid]] if pid in rows_by_id else []
         if not targets:
             print(f"  No lender data for parcel {pid}.")
             pause()
             return
 
+    # Styled once; each letter starts from a deep copy of this empty document
+    base_doc = Document()
+    style = base_doc.styles["Normal"]
+    style.font.name = "Times New Roman"
+    style.font.size = Pt(12)
+
+    saves = []
+    # Letters are built here; saving (XML serialization + zip I/O) is handed
+    # to a small pool since each document is independent once copied
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        # The picker query already carries every column the letter uses
+        for row in targets:
+            sqft = row["sqft"] or 0
+            arrears = get_arrears(row)
+            _now = datetime.now()
+            today_str = _now.strftime("%B %d, %Y")
+
+            doc = copy.deepcopy(base_doc)
+            # Body built as one WordprocessingML string and parsed once
+            P = _w_p
+            parts = [
+                P("SECURITY ONE", bold=True, size=28, center=True),
+                P("[Letterhead — Address / Phone / Email]", center=True),
+                P(), P(today_str), P(),
+
+                # Lender address
+                P("SENT VIA CERTIFIED MAIL"), P(),
+            ]
+            if row["lender_contact"]:
+                parts.append(P(row["lender_contact"]))
+            parts.append(P(row["lender_name"] or ""))
+            if row["lender_address"]:
+                parts.append(P(row["lender_address"]))
+            parts += [
+                P(),
+
+                # Subject
+                P("RE: NOTICE OF COVENANT DEFAULT AND IMMINENT LIEN — SECURED CREDITOR NOTIFICATION",
+                  bold=True, underline=True),
+                P(),
+
+                # Property identification
+                P(f"Property Address:    {row['address']}"),
+                P(f"Tenant/Occupant:     {row['business_name']}"),
+                P(f"Record Owner:        {row['entity_owner'] or 'See deed records'}"),
+            ]
+            if row["county_parcel_id"]:
+                parts.append(P(f"County Parcel ID:    {row['county_parcel_id']}"))
+            if row["deed_of_trust_ref"]:
+                parts.append(P(f"Deed of Trust Ref:   {row['deed_of_trust_ref']}"))
+            if row["loan_number"]:
+                parts.append(P(f"Loan Number:         {row['loan_number']}"))
+            pct = sqft * _INV_CAMPUS_SQFT if sqft else 0
+            parts += [
+                P(),
+                LENDER_BODY_XML.format(sqft=f"{sqft:,}", pct=f"{pct:.4%}", arrears=money(arrears)),
+                P(f"    {row['entity_owner'] or 'Property Owner'} (Borrower)"),
+            ]
+            _append_body_xml(doc, "".join(parts))
+
+            # Save
+            safe_name = row["business_name"].translate(_SAFE_TRANS)
+            safe_lender = (row["lender_name"] or "Lender").translate(_SAFE_TRANS)[:20]
+            filename = f"LenderNotice_{safe_name}_{safe_lender}_{_now:%Y%m%d}.docx"
+            filepath = os.path.join(BASE_DIR, filename)
+            future = pool.submit(_save_docx, doc, filepath)
+
+            # Logged only once the save is known to have succeeded
+            now = _ts(_now)
+            log_entry = (
+                row["id"], now,
+                f"Lender notification generated: {filename}",
+                "USPS Certified (pending)",
+                "Send to lender via certified mail",
+                "Rosenblum",
+                f"Lender: {row['lender_name']}, Arrears: {money(arrears)}",
+            )
+            saves.append((future, log_entry,
+                          (row["business_name"], row["lender_name"], filepath)))
+
     generated = []
-    for target in targets:
-        row = conn.execute("SELECT * FROM parcels WHERE id = ?", (target["id"],)).fetchone()
-        sqft = row["sqft"] or 0
-        arrears = get_arrears(row)
-        today_str = datetime.now().strftime("%B %d, %Y")
-
-        doc = Document()
-        style = doc.styles["Normal"]
-        style.font.name = "Times New Roman"
-        style.font.size = Pt(12)
-
-        # Letterhead
-        p = doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run("SECURITY ONE")
-        run.bold = True
-        run.font.size = Pt(14)
-
-        p = doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.add_run("[Letterhead — Address / Phone / Email]")
-
-        doc.add_paragraph("")
-        doc.add_paragraph(today_str)
-        doc.add_paragraph("")
-
-        # Lender address
-        doc.add_paragraph("SENT VIA CERTIFIED MAIL")
-        doc.add_paragraph("")
-        if row["lender_contact"]:
-            doc.add_paragraph(row["lender_contact"])
-        doc.add_paragraph(row["lender_name"] or "")
-        if row["lender_address"]:
-            doc.add_paragraph(row["lender_address"])
-        doc.add_paragraph("")
-
-        # Subject
-        p = doc.add_paragraph()
-        run = p.add_run("RE: NOTICE OF COVENANT DEFAULT AND IMMINENT LIEN — SECURED CREDITOR NOTIFICATION")
-        run.bold = True
-        run.underline = True
-        doc.add_paragraph("")
-
-        # Property identification
-        doc.add_paragraph(f"Property Address:    {row['address']}")
-        doc.add_paragraph(f"Tenant/Occupant:     {row['business_name']}")
-        doc.add_paragraph(f"Record Owner:        {row['entity_owner'] or 'See deed records'}")
-        if row["county_parcel_id"]:
-            doc.add_paragraph(f"County Parcel ID:    {row['county_parcel_id']}")
-        if row["deed_of_trust_ref"]:
-            doc.add_paragraph(f"Deed of Trust Ref:   {row['deed_of_trust_ref']}")
-        if row["loan_number"]:
-            doc.add_paragraph(f"Loan Number:         {row['loan_number']}")
-        doc.add_paragraph("")
-
-        # Body
-        doc.add_paragraph("Dear Sir or Madam:")
-        doc.add_paragraph("")
-        doc.add_paragraph(
-            "This letter serves as formal notice to you, as the secured lender of record "
-            "for the above-referenced property, that the property is in material default of the "
-            f"Declaration of Restrictive Covenants recorded on {DECLARATION_DATE} "
-            "(the \"Declaration\") governing the Kirby Gate commercial development, Memphis, Tennessee."
-        )
-        doc.add_paragraph("")
-        doc.add_paragraph(
-            "Security One has been designated as the authorized security services provider under "
-            "the Declaration. Pursuant to the Declaration, each parcel owner is obligated to fund "
-            "its pro-rata share of campus-wide security services."
-        )
-        doc.add_paragraph("")
-
-        # Arrears
-        p = doc.add_paragraph()
-        run = p.add_run("DEFAULT AMOUNT:")
-        run.bold = True
-        doc.add_paragraph(f"  Parcel Square Footage:    {sqft:,} SF of {TOTAL_CAMPUS_SQFT:,} SF campus")
-        pct = sqft / TOTAL_CAMPUS_SQFT if sqft else 0
-        doc.add_paragraph(f"  Pro-Rata Share:           {pct:.4%}")
-        doc.add_paragraph(f"  36-Month Arrears Owed:    {money(arrears)}")
-        doc.add_paragraph("")
-
-        # Lien notice
-        p = doc.add_paragraph()
-        run = p.add_run("NOTICE OF IMMINENT LIEN:")
-        run.bold = True
-        doc.add_paragraph(
-            f"Please be advised that unless the above arrears are cured in full, Security One "
-            f"intends to record a Notice of Lien against this property under the Declaration "
-            f"on or before {LIEN_DEADLINE}."
-        )
-        doc.add_paragraph("")
-        doc.add_paragraph(
-            "This lien, arising under a recorded Declaration of Restrictive Covenants, will "
-            "constitute an encumbrance on the property and may affect the priority, marketability, "
-            "and insurability of title. We are providing this notice to allow you, as a secured "
-            "creditor, to take whatever action you deem appropriate to protect your interest, "
-            "including but not limited to:"
-        )
-        doc.add_paragraph("  1. Contacting the borrower/owner to demand cure of the covenant default")
-        doc.add_paragraph("  2. Exercising any rights under your loan documents relating to covenant compliance")
-        doc.add_paragraph("  3. Ensuring that your title insurance covers the covenant lien")
-        doc.add_paragraph("")
-        doc.add_paragraph(
-            "The Declaration provides for lien rights, fee-shifting, and enforcement in "
-            "Shelby County, Tennessee. The applicable statute of limitations for contract "
-            "enforcement is six (6) years under Tennessee law."
-        )
-        doc.add_paragraph("")
-        doc.add_paragraph(
-            "We are available to discuss resolution of this matter and will provide "
-            "updates on the status of enforcement proceedings upon request."
-        )
-        doc.add_paragraph("")
-        doc.add_paragraph("Respectfully,")
-        doc.add_paragraph("")
-        doc.add_paragraph("")
-        doc.add_paragraph("____________________________________")
-        doc.add_paragraph("Brad")
-        doc.add_paragraph("Security One")
-        doc.add_paragraph("")
-        doc.add_paragraph("cc: Jeff Rosenblum, Esq. (Counsel)")
-        doc.add_paragraph(f"    {row['entity_owner'] or 'Property Owner'} (Borrower)")
-
-        # Save
-        safe_name = row["business_name"].replace("/", "-").replace(" ", "_")
-        safe_lender = (row["lender_name"] or "Lender").replace("/", "-").replace(" ", "_")[:20]
-        filename = f"LenderNotice_{safe_name}_{safe_lender}_{datetime.now():%Y%m%d}.docx"
-        filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
-        doc.save(filepath)
-
-        # Log
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        conn.execute(
-            """INSERT INTO enforcement_log
-               (parcel_id, timestamp, action, sent_via, next_step, attorney, notes)
-               VALUES (?,?,?,?,?,?,?)""",
-            (target["id"], now,
-             f"Lender notification generated: {filename}",
-             "USPS Certified (pending)",
-             "Send to lender via certified mail",
-             "Rosenblum",
-             f"Lender: {row['lender_name']}, Arrears: {money(arrears)}"),
-        )
-        conn.commit()
-        generated.append((row["business_name"], row["lender_name"], filepath))
+    log_entries = []
+    failed = []
+    for future, log_entry, letter in saves:
+        try:
+            future.result()
+        except Exception as exc:
+            failed.append((letter, exc))
+        else:
+            log_entries.append(log_entry)
+            generated.append(letter)
+    log_actions(conn, log_entries)
 
     print(f"\n  Generated {len(generated)} lender notification(s):")
     for biz, lender, fp in generated:
         print(f"    {biz} -> {lender}")
         print(f"      {fp}")
+    if failed:
+        print(f"\n  FAILED to save {len(failed)} lender notification(s) (not logged):")
+        for (biz, lender, fp), exc in failed:
+            print(f"    {biz} -> {lender}")
+            print(f"      {fp}: {exc}")
     pause()
 
 
@@ -1982,17 +2166,31 @@ def generate_lender_notification(conn):
 
 def main_menu():
     conn = get_db()
+    # Delinquent count for the header; recounted only after this connection
+    # has written something (total_changes moves on every INSERT/UPDATE/DELETE)
+    delinq = None
+    counted_at = None
+    # Header clock only shows minutes, so it is reformatted once per minute
+    clock = ""
+    clock_minute = None
 
     while True:
         clear()
-        days_to_lien = (datetime.strptime(LIEN_DEADLINE, "%Y-%m-%d") - datetime.now()).days
-        delinq = conn.execute("SELECT COUNT(*) as c FROM parcels WHERE status='DELINQUENT'").fetchone()["c"]
+        now = datetime.now()
+        days_to_lien = (LIEN_DEADLINE_DT - now).days
+        minute = (now.year, now.month, now.day, now.hour, now.minute)
+        if minute != clock_minute:
+            clock = f"{now:%B %d, %Y %I:%M %p}"
+            clock_minute = minute
+        if conn.total_changes != counted_at:
+            delinq = conn.execute("SELECT COUNT(*) as c FROM parcels WHERE status='DELINQUENT'").fetchone()["c"]
+            counted_at = conn.total_changes
 
         print()
         print("  ============================================================")
         print("  KIRBY GATE ENFORCEMENT SYSTEM")
         print("  ============================================================")
-        print(f"  {datetime.now():%B %d, %Y %I:%M %p}")
+        print(f"  {clock}")
         print(f"  Lien deadline: {LIEN_DEADLINE} ({days_to_lien} days)")
         print(f"  Delinquent parcels: {delinq}")
         print("  ============================================================")
@@ -1,4 +1,8 @@
-"""Rebuild kirbygate.db with corrected 10 delinquent targets from Solutions spreadsheet."""
+"""Rebuild kirbygate.db with corrected 10 delinquent targets from Solutions spreadsheet.
+
+Close kirbygate.py and gen_demands.py first: the rebuilt file replaces the
+live one, and a connection left open would keep writing to the old file.
+"""
 
 import os
 import sqlite3
@@ -9,16 +13,22 @@ if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
 
 DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kirbygate.db")
+# Built beside the live file and swapped in only once fully written, so a
+# failed run leaves the previous database untouched
+DB_NEW = DB + ".new"
 CAMPUS_SQFT = 672_718
 
-# Delete old DB
-if os.path.exists(DB):
-    os.remove(DB)
-    print("  Deleted old kirbygate.db")
+# Leftover from an interrupted run
+if os.path.exists(DB_NEW):
+    os.remove(DB_NEW)
 
-conn = sqlite3.connect(DB)
-conn.row_factory = sqlite3.Row
+conn = sqlite3.connect(DB_NEW)
 conn.execute("PRAGMA foreign_keys = ON")
+# Throwaway rebuild from literals above: skip fsyncs and keep the rollback
+# journal in memory (neither setting persists in the file)
+conn.execute("PRAGMA synchronous = OFF")
+conn.execute("PRAGMA journal_mode = MEMORY")
+conn.execute("PRAGMA temp_store = MEMORY")
 
 conn.executescript("""
 CREATE TABLE parcels (
@@ -42,6 +52,7 @@ CREATE TABLE parcels (
     deadline          TEXT,
     notes             TEXT
 );
+CREATE INDEX idx_parcels_status_sqft ON parcels(status, sqft DESC);
 CREATE TABLE enforcement_log (
     id                INTEGER PRIMARY KEY AUTOINCREMENT,
     parcel_id         INTEGER,
@@ -64,6 +75,9 @@ CREATE TABLE rates (
 );
 """)
 
+# All seed rows below go in as one transaction, committed once at the end
+conn.execute("BEGIN")
+
 # ── PAYING PARCELS (9 current) ──────────────────────────────────────────────
 
 current_parcels = [
@@ -78,16 +92,15 @@ current_parcels = [
     ("2725 Kirby Pkwy",       "FedEx Office / Retail",     18000, "Kirby Pkwy Retail LLC",  ""),
 ]
 
-for addr, name, sqft, entity, corp in current_parcels:
-    pct = sqft / CAMPUS_SQFT
-    conn.execute(
-        """INSERT INTO parcels
-           (address, business_name, sqft, pct_campus, status,
-            entity_owner, corporate_target, past_due_balance, weekly_rate,
-            enforcement_step)
-           VALUES (?,?,?,?,?,?,?,?,?,?)""",
-        (addr, name, sqft, pct, "CURRENT", entity, corp, 0, 0, "Paying"),
-    )
+conn.executemany(
+    """INSERT INTO parcels
+       (address, business_name, sqft, pct_campus, status,
+        entity_owner, corporate_target, past_due_balance, weekly_rate,
+        enforcement_step)
+       VALUES (?,?,?,?,?,?,?,?,?,?)""",
+    [(addr, name, sqft, sqft / CAMPUS_SQFT, "CURRENT", entity, corp, 0, 0, "Paying")
+     for addr, name, sqft, entity, corp in current_parcels],
+)
 
 
 # ── 10 DELINQUENT TARGETS (corrected from Solutions spreadsheet) ─────────────
@@ -198,19 +211,17 @@ delinquent_targets = [
     ),
 ]
 
-for t in delinquent_targets:
-    (addr, name, sqft, entity, corp,
-     past_due, weekly, step, next_act, deadline, notes) = t
-    pct = sqft / CAMPUS_SQFT
-    conn.execute(
-        """INSERT INTO parcels
-           (address, business_name, sqft, pct_campus, status,
-            entity_owner, corporate_target, past_due_balance, weekly_rate,
-            enforcement_step, next_action, deadline, notes)
-           VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-        (addr, name, sqft, pct, "DELINQUENT", entity, corp,
-         past_due, weekly, step, next_act, deadline, notes),
-    )
+conn.executemany(
+    """INSERT INTO parcels
+       (address, business_name, sqft, pct_campus, status,
+        entity_owner, corporate_target, past_due_balance, weekly_rate,
+        enforcement_step, next_action, deadline, notes)
+       VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+    [(addr, name, sqft, sqft / CAMPUS_SQFT, "DELINQUENT", entity, corp,
+      past_due, weekly, step, next_act, deadline, notes)
+     for (addr, name, sqft, entity, corp,
+          past_due, weekly, step, next_act, deadline, notes) in delinquent_targets],
+)
 
 
 # ── RATES TABLE ──────────────────────────────────────────────────────────────
@@ -222,16 +233,12 @@ rates = [
     ("Arrears Period (weeks)", 156, "2022-12-01"),
     ("Cure Period (days)", 15, "2011-05-05"),
 ]
-for label, val, dt in rates:
-    conn.execute(
-        "INSERT INTO rates (label, value, effective_date) VALUES (?,?,?)",
-        (label, val, dt),
-    )
+conn.executemany("INSERT INTO rates (label, value, effective_date) VALUES (?,?,?)", rates)
 
 
 # ── ENFORCEMENT LOG SEED ─────────────────────────────────────────────────────
 
-now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+now = datetime.now().isoformat(sep=" ", timespec="seconds")
 conn.execute(
     """INSERT INTO enforcement_log
        (parcel_id, timestamp, action, next_step, attorney, notes)
@@ -242,64 +249,90 @@ conn.execute(
      "Rosenblum", "All figures verified against KIRBY GATES Solution_.xlsx"),
 )
 
-conn.commit()
+conn.commit()  # closes the seeding transaction opened above
+conn.close()
+
+# synchronous = OFF skipped every flush; one fsync before the swap instead
+with open(DB_NEW, "rb+") as f:
+    os.fsync(f.fileno())
+replaced = os.path.exists(DB)
+if replaced:
+    # Fold the live file's WAL back into it and truncate the log. busy means
+    # another connection is still using it, so nothing is swapped. The
+    # -wal/-shm files are left to SQLite, which removes them when the last
+    # connection closes.
+    live = sqlite3.connect(DB)
+    busy = live.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+    live.close()
+    if busy:
+        os.remove(DB_NEW)
+        sys.exit("  Error: kirbygate.db is in use. Close kirbygate.py and "
+                 "gen_demands.py, then run the rebuild again.")
+os.replace(DB_NEW, DB)
+if replaced:
+    print("  Replaced old kirbygate.db")
+
 
+# ── SUMMARY ──────────────────────────────────────────────────────────────────
 
-# ── VERIFY & PRINT ───────────────────────────────────────────────────────────
+_MONEY_FMT = "${:,.2f}".format
 
 def money(val):
-    if val is None:
-        return "TBD"
-    return f"${val:,.2f}"
+    return "TBD" if val is None else _MONEY_FMT(val)
 
 print()
 print("  DATABASE REBUILT SUCCESSFULLY")
 print("  " + "=" * 90)
 print()
 
-rows = conn.execute(
-    "SELECT * FROM parcels ORDER BY status DESC, sqft DESC"
-).fetchall()
+# Printed from the source lists rather than re-read from the database. Ids
+# follow insert order on the fresh AUTOINCREMENT table; the sort matches
+# ORDER BY status DESC, sqft DESC.
+rows = [
+    (pid, "CURRENT", addr, name, sqft, None, None)
+    for pid, (addr, name, sqft, _, _) in enumerate(current_parcels, 1)
+] + [
+    (pid, "DELINQUENT", t[0], t[1], t[2], t[5], t[6])
+    for pid, t in enumerate(delinquent_targets, len(current_parcels) + 1)
+]
+rows.sort(key=lambda r: (r[1], r[4]), reverse=True)
 
 cur_count = 0
 del_count = 0
 total_arrears = 0
 total_weekly = 0
 
-print(f"  {'ID':>3}  {'Status':<12} {'Address':<24} {'Business':<30} "
-      f"{'SqFt':>8} {'Past Due':>14} {'$/Week':>10}")
-print("  " + "-" * 108)
+# Table and totals are assembled first and written in one call
+out = [
+    f"  {'ID':>3}  {'Status':<12} {'Address':<24} {'Business':<30} "
+    f"{'SqFt':>8} {'Past Due':>14} {'$/Week':>10}",
+    "  " + "-" * 108,
+]
 
-for r in rows:
-    sqft = r["sqft"] or 0
-    if r["status"] == "DELINQUENT":
+for pid, status, addr, name, sqft, pd, wk in rows:
+    if status == "DELINQUENT":
         del_count += 1
-        # Find matching target for past_due and weekly
-        for t in delinquent_targets:
-            if t[0] == r["address"]:
-                pd = t[5]
-                wk = t[6]
-                pd_str = money(pd) if pd is not None else "TBD"
-                wk_str = money(wk)
-                if pd:
-                    total_arrears += pd
-                total_weekly += wk
-                break
+        pd_str = money(pd)
+        wk_str = money(wk)
+        if pd:
+            total_arrears += pd
+        total_weekly += wk
     else:
         cur_count += 1
         pd_str = "\u2014"
         wk_str = "\u2014"
 
-    print(f"  {r['id']:>3}  {r['status']:<12} {r['address']:<24} "
-          f"{r['business_name']:<30} {sqft:>8,} {pd_str:>14} {wk_str:>10}")
+    out.append(f"  {pid:>3}  {status:<12} {addr:<24} "
+               f"{name:<30} {sqft:>8,} {pd_str:>14} {wk_str:>10}")
 
-print("  " + "-" * 108)
-print()
-print(f"  Paying parcels:      {cur_count}")
-print(f"  Delinquent targets:  {del_count}")
-print(f"  Total parcels:       {cur_count + del_count}")
-print(f"  Total known arrears: {money(total_arrears)}")
-print(f"  Total weekly (delq): {money(total_weekly)}")
-print()
-
-conn.close()
+out += [
+    "  " + "-" * 108,
+    "",
+    f"  Paying parcels:      {cur_count}",
+    f"  Delinquent targets:  {del_count}",
+    f"  Total parcels:       {cur_count + del_count}",
+    f"  Total known arrears: {money(total_arrears)}",
+    f"  Total weekly (delq): {money(total_weekly)}",
+    "",
+]
+sys.stdout.write("\n".join(out) + "\n")
@@ -11,11 +11,9 @@ Usage:
 """
 
 import argparse
-import csv
 import os
 import sqlite3
 import sys
-import textwrap
 from datetime import datetime
 
 # Force UTF-8 output on Windows
@@ -71,6 +69,13 @@ FIELD_NAMES = [
     "notes",
 ]
 
+# Membership checks for cmd_update; the lists above keep display order
+FIELD_NAMES_SET = frozenset(FIELD_NAMES)
+VALID_STATUSES_SET = frozenset(VALID_STATUSES)
+
+# One fixed UPDATE per whitelisted field, so each SQL text is built once
+_UPDATE_SQL = {f: f"UPDATE targets SET {f} = ? WHERE id = ?" for f in FIELD_NAMES}
+
 SEED_DATA = [
     {
         "entity_name": "Kroger",
@@ -124,32 +129,52 @@ SEED_DATA = [
     },
 ]
 
+# Every seed row carries the same keys, so one statement covers them all
+SEED_COLS = tuple(SEED_DATA[0])
+SEED_INSERT_SQL = (
+    f"INSERT INTO targets ({', '.join(SEED_COLS)}) "
+    f"VALUES ({', '.join('?' * len(SEED_COLS))})"
+)
+
+
+_conn = None  # opened by the first get_db(), shared until close_db()
+
 
 def get_db():
-    """Open (and optionally initialize) the database."""
+    """Return the shared connection, opening (and initializing) it once."""
+    global _conn
+    if _conn is not None:
+        return _conn
     fresh = not os.path.exists(DB_PATH)
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    # WAL is persistent in the file; only switch when it is not already set
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
     conn.execute(SCHEMA)
     if fresh:
-        for row in SEED_DATA:
-            cols = ", ".join(row.keys())
-            placeholders = ", ".join(["?"] * len(row))
-            conn.execute(
-                f"INSERT INTO targets ({cols}) VALUES ({placeholders})",
-                list(row.values()),
-            )
+        conn.executemany(SEED_INSERT_SQL, [[row[c] for c in SEED_COLS] for row in SEED_DATA])
         conn.commit()
+    _conn = conn
     return conn
 
 
+def close_db():
+    """Close the shared connection, if one is open."""
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+
+
 # ── Display helpers ──────────────────────────────────────────────────────────
 
 
+_MONEY_FMT = "${:,.2f}".format
+
 def fmt_money(val):
-    if val is None or val == 0:
-        return "—"
-    return f"${val:,.2f}"
+    return "—" if val is None or val == 0 else _MONEY_FMT(val)
 
 
 def truncate(text, width):
@@ -159,8 +184,21 @@ def truncate(text, width):
     return text if len(text) <= width else text[: width - 1] + "…"
 
 
-def print_table(rows):
-    """Print a compact summary table to stdout."""
+# Columns print_table reads, unpacked positionally
+LIST_COLUMNS = (
+    "id, entity_name, property_address, past_due_balance, weekly_rate, "
+    "status, certified_mail_tracking, date_packet_sent"
+)
+
+# One summary-table row; bound once so the loop only formats
+ROW_FMT = "{:>3}  {:<16} {:<20} {:>12} {:>10} {:<17} {:<24} {:<12}".format
+
+
+def print_table(rows, totals):
+    """Print a compact summary table to stdout.
+
+    rows are plain tuples in LIST_COLUMNS order; totals is (past_due, weekly).
+    """
     if not rows:
         print("  No targets found.")
         return
@@ -171,25 +209,28 @@ def print_table(rows):
         f"{'$/Week':>10} {'Status':<17} {'Mail Track#':<24} {'Packet Sent':<12}"
     )
     sep = "─" * len(header)
-    print(sep)
-    print(header)
-    print(sep)
-    for r in rows:
-        line = (
-            f"{r['id']:>3}  {truncate(r['entity_name'], 16):<16} "
-            f"{truncate(r['property_address'], 20):<20} "
-            f"{fmt_money(r['past_due_balance']):>12} "
-            f"{fmt_money(r['weekly_rate']):>10} "
-            f"{truncate(r['status'], 17):<17} "
-            f"{truncate(r['certified_mail_tracking'], 24):<24} "
-            f"{truncate(r['date_packet_sent'], 12):<12}"
+    # Whole table is assembled first and written in one call
+    out = [sep, header, sep]
+    out.extend(
+        ROW_FMT(
+            tid,
+            truncate(entity, 16),
+            truncate(address, 20),
+            fmt_money(past_due),
+            fmt_money(weekly),
+            truncate(status, 17),
+            truncate(tracking, 24),
+            truncate(sent, 12),
         )
-        print(line)
-    print(sep)
-    totals = sum(r["past_due_balance"] or 0 for r in rows)
-    weekly = sum(r["weekly_rate"] or 0 for r in rows)
-    print(f"     {'TOTALS':<16} {'':<20} {fmt_money(totals):>12} {fmt_money(weekly):>10}")
-    print()
+        for tid, entity, address, past_due, weekly, status, tracking, sent in rows
+    )
+    past_due, weekly = totals
+    out += [
+        sep,
+        f"     {'TOTALS':<16} {'':<20} {fmt_money(past_due):>12} {fmt_money(weekly):>10}",
+        "",
+    ]
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def print_detail(r):
@@ -222,9 +263,15 @@ def print_detail(r):
 
 
 def cmd_list(conn, _args):
-    rows = conn.execute("SELECT * FROM targets ORDER BY id").fetchall()
+    # Plain tuples for the table; sqlite3.Row stays for the detail view
+    cur = conn.cursor()
+    cur.row_factory = None
+    rows = cur.execute(f"SELECT {LIST_COLUMNS} FROM targets ORDER BY id").fetchall()
+    totals = conn.execute(
+        "SELECT COALESCE(SUM(past_due_balance), 0), COALESCE(SUM(weekly_rate), 0) FROM targets"
+    ).fetchone()
     print(f"\n  KIRBY GATE — Covenant Enforcement Tracker  ({len(rows)} targets)\n")
-    print_table(rows)
+    print_table(rows, totals)
 
 
 def cmd_view(conn, args):
@@ -239,13 +286,13 @@ def cmd_update(conn, args):
     field = args.field
     value = args.value
 
-    if field not in FIELD_NAMES:
+    if field not in FIELD_NAMES_SET:
         print(f"  Error: unknown field '{field}'")
         print(f"  Run 'python tracker.py fields' to see valid field names.")
         return
 
     # Validate status values
-    if field == "status" and value not in VALID_STATUSES:
+    if field == "status" and value not in VALID_STATUSES_SET:
         print(f"  Error: invalid status '{value}'")
         print(f"  Valid statuses: {', '.join(VALID_STATUSES)}")
         return
@@ -259,9 +306,7 @@ def cmd_update(conn, args):
             print(f"  Error: '{args.value}' is not a valid number.")
             return
 
-    cur = conn.execute(
-        f"UPDATE targets SET {field} = ? WHERE id = ?", (value, args.id)
-    )
+    cur = conn.execute(_UPDATE_SQL[field], (value, args.id))
     conn.commit()
     if cur.rowcount == 0:
         print(f"  Error: no target with ID {args.id}")
@@ -270,19 +315,30 @@ def cmd_update(conn, args):
         print(f"  Updated {row['entity_name']} — {field} = {value}")
 
 
+_STAMP_TRANS = str.maketrans("T", "_", "-:")
+
+
 def cmd_export(conn, args):
-    filename = args.filename or f"kirby_gate_{datetime.now():%Y%m%d_%H%M%S}.csv"
-    rows = conn.execute("SELECT * FROM targets ORDER BY id").fetchall()
-    if not rows:
+    import csv  # only export needs it; kept off the startup path
+    filename = args.filename
+    if not filename:
+        # ISO stamp reshaped to YYYYMMDD_HHMMSS without going through strftime
+        stamp = datetime.now().isoformat(timespec="seconds").translate(_STAMP_TRANS)
+        filename = f"kirby_gate_{stamp}.csv"
+    # Streamed from the cursor; sqlite3.Row iterates in column order
+    cur = conn.execute("SELECT * FROM targets ORDER BY id")
+    first = cur.fetchone()
+    if first is None:
         print("  No data to export.")
         return
-    keys = rows[0].keys()
     with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(dict(r))
-    print(f"  Exported {len(rows)} records to {os.path.abspath(filename)}")
+        writer = csv.writer(f)
+        writer.writerow(first.keys())
+        writer.writerow(first)
+        count = 1
+        for count, r in enumerate(cur, 2):
+            writer.writerow(r)
+    print(f"  Exported {count} records to {os.path.abspath(filename)}")
 
 
 def cmd_fields(_conn, _args):
@@ -298,6 +354,7 @@ def cmd_fields(_conn, _args):
 
 
 def cmd_help(_conn, _args):
+    import textwrap
     print(textwrap.dedent(__doc__))
 
 
@@ -344,7 +401,7 @@ def main():
     try:
         dispatch[args.command](conn, args)
     finally:
-        conn.close()
+        close_db()
 
 
 if __name__ == "__main__":